@@ -158,13 +158,14 @@ def main():
         else:
             logger.info(f"Connecting to Active Directory domain: {config['domain']}...")
             
-        ad_connector = ADConnector(config)
-        
-        # Perform security assessment
-        logger.info("Starting security assessment...")
-        assessment = SecurityAssessment(ad_connector, config)
-        assessment_results = assessment.run_assessment()
-        
+        # Bind once and reuse the connection for the whole assessment,
+        # instead of paying a TLS handshake and bind per query
+        with ADConnector(config) as ad_connector:
+            # Perform security assessment
+            logger.info("Starting security assessment...")
+            assessment = SecurityAssessment(ad_connector, config)
+            assessment_results = assessment.run_assessment()
+
         # Generate reports
         logger.info("Generating reports...")
         report_generator = ReportGenerator(assessment_results, args.output_dir)
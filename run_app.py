@@ -7,16 +7,54 @@ This script directly runs the main application after ensuring all dependencies a
 
 import sys
 import subprocess
+import hashlib
 import os
 
+# Stamp file recording the hash of requirements.txt at last successful install
+_STAMP_FILE = '.requirements.stamp'
+
+def _is_in_venv():
+    """Check if we're running inside a virtual environment (venv, virtualenv or conda)."""
+    return hasattr(sys, 'real_prefix') or sys.prefix != sys.base_prefix
+
+def _requirements_hash():
+    """Compute the hash of requirements.txt, or None if it cannot be read."""
+    try:
+        with open('requirements.txt', 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except (OSError, IOError):
+        return None
+
+def _requirements_up_to_date():
+    """Check if dependencies were already installed for the current requirements.txt."""
+    requirements_hash = _requirements_hash()
+    if not requirements_hash:
+        return False
+
+    try:
+        with open(_STAMP_FILE, 'r') as f:
+            return f.read().strip() == requirements_hash
+    except (OSError, IOError):
+        return False
+
+def _write_requirements_stamp():
+    """Record the current requirements.txt hash after a successful install."""
+    requirements_hash = _requirements_hash()
+    if requirements_hash:
+        try:
+            with open(_STAMP_FILE, 'w') as f:
+                f.write(requirements_hash)
+        except (OSError, IOError):
+            pass
+
 def main():
     """Main entry point for the application runner."""
     print("Active Directory Security Assessment Agent - Direct Runner")
     print("=" * 60)
-    
+
     # Check if we're in a virtual environment
-    in_venv = sys.prefix != sys.base_prefix
-    
+    in_venv = _is_in_venv()
+
     if not in_venv:
         print("\nWarning: You are not running in a virtual environment.")
         print("It is recommended to use run.sh or run.bat instead.")
@@ -24,31 +62,38 @@ def main():
         if choice != 'y':
             print("Exiting. Please use run.sh or run.bat to set up a proper environment.")
             return 1
-    
-    # Install setuptools first to ensure pkg_resources is available
-    print("\nInstalling setuptools...")
-    try:
-        subprocess.check_call([sys.executable, '-m', 'pip', 'install', 'setuptools'])
-    except subprocess.CalledProcessError:
-        print("Warning: Failed to install setuptools.")
-    
-    # Install dependencies if needed
-    print("\nEnsuring all dependencies are installed...")
-    try:
-        subprocess.check_call([sys.executable, '-m', 'pip', 'install', '-r', 'requirements.txt'])
-    except subprocess.CalledProcessError:
-        print("Error: Failed to install dependencies.")
-        return 1
-    
+
+    # Skip the pip installs entirely when dependencies are already current
+    if _requirements_up_to_date():
+        print("\nDependencies are up to date.")
+    else:
+        # Install setuptools (for pkg_resources) and all dependencies in a
+        # single pip invocation so the resolver only runs once
+        print("\nEnsuring all dependencies are installed...")
+        try:
+            subprocess.check_call([
+                sys.executable, '-m', 'pip', 'install', '--upgrade',
+                'setuptools', 'wheel', '-r', 'requirements.txt'
+            ])
+        except subprocess.CalledProcessError:
+            print("Error: Failed to install dependencies.")
+            return 1
+
+        _write_requirements_stamp()
+
     # Run the main application in mock mode by default
     print("\nStarting Active Directory Security Assessment Agent in mock mode...\n")
     try:
-        # Use subprocess to run the main script with mock mode enabled
-        subprocess.call([sys.executable, 'main.py', '--mock'])
-    except Exception as e:
-        print(f"Error running the application: {str(e)}")
-        return 1
-    
+        # Replace this process with main.py instead of spawning a second interpreter
+        os.execv(sys.executable, [sys.executable, 'main.py', '--mock'])
+    except OSError:
+        # Fall back to a child process if execv is unavailable on this platform
+        try:
+            subprocess.call([sys.executable, 'main.py', '--mock'])
+        except Exception as e:
+            print(f"Error running the application: {str(e)}")
+            return 1
+
     return 0
 
 if __name__ == "__main__":
@@ -5,6 +5,7 @@ Test runner for the Active Directory Security Assessment Agent.
 
 import os
 import sys
+import shutil
 import unittest
 import argparse
 import logging
@@ -27,20 +28,30 @@ def run_tests(test_path=None, verbose=False):
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
     
+    # Prune stale bytecode caches so discovery doesn't walk them
+    if verbose:
+        for root, dirs, _ in os.walk('src/tests'):
+            if '__pycache__' in dirs:
+                shutil.rmtree(os.path.join(root, '__pycache__'), ignore_errors=True)
+
+    # Use a fresh loader with an explicit pattern so discovery only
+    # imports real test modules
+    test_loader = unittest.TestLoader()
+
     # Discover and run tests
     if test_path:
         if os.path.isfile(test_path):
             # Run specific test file
-            test_suite = unittest.defaultTestLoader.discover(
+            test_suite = test_loader.discover(
                 os.path.dirname(test_path),
                 pattern=os.path.basename(test_path)
             )
         else:
             # Run all tests in directory
-            test_suite = unittest.defaultTestLoader.discover(test_path)
+            test_suite = test_loader.discover(test_path, pattern='test_*.py')
     else:
         # Run all tests
-        test_suite = unittest.defaultTestLoader.discover('src/tests')
+        test_suite = test_loader.discover('src/tests', pattern='test_*.py')
     
     # Run the tests
     test_runner = unittest.TextTestRunner(verbosity=2 if verbose else 1)
@@ -9,11 +9,13 @@ import os
 import sys
 import subprocess
 import argparse
+import hashlib
+import json
 import time
 import logging
 import platform
 import webbrowser
-from threading import Thread
+from threading import Timer
 
 # Configure logging
 logging.basicConfig(
@@ -26,6 +28,46 @@ def is_windows():
     """Check if the current platform is Windows."""
     return platform.system().lower() == 'windows'
 
+# Common npm installation paths on Windows
+_COMMON_NPM_PATHS = (
+    os.path.join(os.environ.get('ProgramFiles', ''), 'nodejs', 'npm.cmd'),
+    os.path.join(os.environ.get('ProgramFiles(x86)', ''), 'nodejs', 'npm.cmd'),
+    os.path.join(os.environ.get('APPDATA', ''), 'npm', 'npm.cmd'),
+    os.path.join(os.environ.get('APPDATA', ''), 'Roaming', 'npm', 'npm.cmd')
+)
+
+def _find_npm_windows():
+    """Find npm in the common Windows installation paths.
+
+    Returns:
+        Path to npm.cmd or None if not found
+    """
+    for npm_path in _COMMON_NPM_PATHS:
+        if os.path.exists(npm_path):
+            return npm_path
+    return None
+
+# Cached parse of the frontend package.json
+_PACKAGE_JSON_CACHE = None
+
+def _load_package_json(frontend_dir):
+    """Load and cache the frontend package.json.
+
+    Returns:
+        Parsed package.json dictionary (empty on read/parse failure)
+    """
+    global _PACKAGE_JSON_CACHE
+
+    if _PACKAGE_JSON_CACHE is None:
+        try:
+            with open(os.path.join(frontend_dir, 'package.json'), 'r') as f:
+                _PACKAGE_JSON_CACHE = json.load(f)
+        except (OSError, IOError, ValueError) as e:
+            logger.warning(f"Failed to read frontend package.json: {str(e)}")
+            _PACKAGE_JSON_CACHE = {}
+
+    return _PACKAGE_JSON_CACHE
+
 def run_api_server(host, port, debug, load_sample_data):
     """Run the Flask API server."""
     logger.info(f"Starting API server on {host}:{port}")
@@ -51,13 +93,15 @@ def run_api_server(host, port, debug, load_sample_data):
                 creationflags=subprocess.CREATE_NEW_CONSOLE
             )
         else:
+            # Send output to a log file; an undrained PIPE would block the
+            # server once the pipe buffer fills up
+            log_file = open('.api_server.log', 'ab')
             process = subprocess.Popen(
                 cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
+                stdout=log_file,
+                stderr=subprocess.STDOUT
             )
-        
+
         logger.info(f"API server process started with PID {process.pid}")
         return process
     except Exception as e:
@@ -92,13 +136,15 @@ def run_frontend_server(port):
             )
         else:
             cmd = ['npm', 'start']
+            # Send output to a log file; an undrained PIPE would block the
+            # server once the pipe buffer fills up
+            log_file = open('.frontend_server.log', 'ab')
             process = subprocess.Popen(
                 cmd,
                 cwd=frontend_dir,
                 env=env,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
+                stdout=log_file,
+                stderr=subprocess.STDOUT
             )
         
         logger.info(f"Frontend server process started with PID {process.pid}")
@@ -129,36 +175,29 @@ def run_frontend_server(port):
             logger.warning(f"Failed to start frontend server using npm.cmd: {str(e)}")
         
         # Method 2: Try common npm paths
-        common_paths = [
-            os.path.join(os.environ.get('ProgramFiles', ''), 'nodejs', 'npm.cmd'),
-            os.path.join(os.environ.get('ProgramFiles(x86)', ''), 'nodejs', 'npm.cmd'),
-            os.path.join(os.environ.get('APPDATA', ''), 'npm', 'npm.cmd'),
-            os.path.join(os.environ.get('APPDATA', ''), 'Roaming', 'npm', 'npm.cmd')
-        ]
-        
-        for npm_path in common_paths:
-            if os.path.exists(npm_path):
-                try:
-                    logger.info(f"Running '{npm_path} start' in frontend directory...")
-                    
-                    process = subprocess.Popen(
-                        [npm_path, 'start'],
-                        cwd=frontend_dir,
-                        env=env,
-                        creationflags=subprocess.CREATE_NEW_CONSOLE
-                    )
-                    
-                    logger.info(f"Frontend server process started with PID {process.pid} using {npm_path}")
-                    return process
-                except Exception as e:
-                    logger.warning(f"Failed to start frontend server using {npm_path}: {str(e)}")
+        npm_path = _find_npm_windows()
+        if npm_path:
+            try:
+                logger.info(f"Running '{npm_path} start' in frontend directory...")
+
+                process = subprocess.Popen(
+                    [npm_path, 'start'],
+                    cwd=frontend_dir,
+                    env=env,
+                    creationflags=subprocess.CREATE_NEW_CONSOLE
+                )
+
+                logger.info(f"Frontend server process started with PID {process.pid} using {npm_path}")
+                return process
+            except Exception as e:
+                logger.warning(f"Failed to start frontend server using {npm_path}: {str(e)}")
         
         # Method 3: Try using where.exe to find npm
         try:
             result = subprocess.run(
                 ['where', 'npm'],
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
                 text=True,
                 check=False
             )
@@ -189,7 +228,7 @@ def run_frontend_server(port):
             node_result = subprocess.run(
                 ['where', 'node'],
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
                 text=True,
                 check=False
             )
@@ -199,11 +238,9 @@ def run_frontend_server(port):
                 
                 # Get the start script from package.json
                 try:
-                    with open(os.path.join(frontend_dir, 'package.json'), 'r') as f:
-                        import json
-                        package_json = json.load(f)
-                        start_script = package_json.get('scripts', {}).get('start', 'react-scripts start')
-                    
+                    package_json = _load_package_json(frontend_dir)
+                    start_script = package_json.get('scripts', {}).get('start', 'react-scripts start')
+
                     logger.info(f"Running Node.js directly with start script: {start_script}")
                     
                     # Run node with the start script
@@ -253,45 +290,22 @@ def check_npm_installed():
         logger.info("Trying alternative methods to find npm on Windows...")
         
         # Method 1: Check common installation paths
-        common_paths = [
-            os.path.join(os.environ.get('ProgramFiles', ''), 'nodejs', 'npm.cmd'),
-            os.path.join(os.environ.get('ProgramFiles(x86)', ''), 'nodejs', 'npm.cmd'),
-            os.path.join(os.environ.get('APPDATA', ''), 'npm', 'npm.cmd'),
-            os.path.join(os.environ.get('APPDATA', ''), 'Roaming', 'npm', 'npm.cmd')
-        ]
-        
-        for path in common_paths:
-            if os.path.exists(path):
-                logger.info(f"Found npm at: {path}")
-                
-                # Try to run it to verify
-                try:
-                    result = subprocess.run(
-                        [path, '--version'],
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE,
-                        text=True,
-                        check=False
-                    )
-                    
-                    if result.returncode == 0:
-                        npm_version = result.stdout.strip()
-                        logger.info(f"npm version {npm_version} found at {path}")
-                        
-                        # Add the directory to PATH for future use
-                        os.environ['PATH'] = os.path.dirname(path) + os.pathsep + os.environ.get('PATH', '')
-                        logger.info(f"Added {os.path.dirname(path)} to PATH")
-                        
-                        return True
-                except Exception as e:
-                    logger.warning(f"Error running npm from {path}: {str(e)}")
+        path = _find_npm_windows()
+        if path:
+            logger.info(f"Found npm at: {path}")
+
+            # Add the directory to PATH for future use
+            os.environ['PATH'] = os.path.dirname(path) + os.pathsep + os.environ.get('PATH', '')
+            logger.info(f"Added {os.path.dirname(path)} to PATH")
+
+            return True
         
         # Method 2: Try using where.exe to find npm
         try:
             result = subprocess.run(
                 ['where', 'npm'],
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
                 text=True,
                 check=False
             )
@@ -305,7 +319,7 @@ def check_npm_installed():
                     version_result = subprocess.run(
                         [npm_path, '--version'],
                         stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE,
+                        stderr=subprocess.DEVNULL,
                         text=True,
                         check=False
                     )
@@ -330,7 +344,7 @@ def check_npm_installed():
             node_result = subprocess.run(
                 ['where', 'node'],
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
                 text=True,
                 check=False
             )
@@ -350,7 +364,7 @@ def check_npm_installed():
                         version_result = subprocess.run(
                             [npm_path, '--version'],
                             stdout=subprocess.PIPE,
-                            stderr=subprocess.PIPE,
+                            stderr=subprocess.DEVNULL,
                             text=True,
                             check=False
                         )
@@ -372,19 +386,43 @@ def check_npm_installed():
     logger.error("npm not found after trying multiple methods")
     return False
 
+def _dependencies_up_to_date(frontend_dir):
+    """Check if installed frontend dependencies already match package-lock.json."""
+    node_modules = os.path.join(frontend_dir, 'node_modules')
+    lock_file = os.path.join(frontend_dir, 'package-lock.json')
+    installed_lock_file = os.path.join(node_modules, '.package-lock.json')
+
+    if not os.path.isdir(node_modules):
+        return False
+
+    try:
+        with open(lock_file, 'rb') as f:
+            lock_hash = hashlib.sha256(f.read()).hexdigest()
+        with open(installed_lock_file, 'rb') as f:
+            installed_hash = hashlib.sha256(f.read()).hexdigest()
+
+        return lock_hash == installed_hash
+    except (OSError, IOError):
+        return False
+
 def install_frontend_dependencies():
     """Install frontend dependencies using npm."""
-    logger.info("Installing frontend dependencies...")
-    
     frontend_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'frontend')
-    
+
+    # Skip npm entirely when the installed tree already matches the lock file
+    if _dependencies_up_to_date(frontend_dir):
+        logger.info("Frontend dependencies are up to date, skipping npm install")
+        return True
+
+    logger.info("Installing frontend dependencies...")
+
     # First try the standard way with --force flag and suppressing vulnerability warnings
     try:
         logger.info("Running 'npm install --force --no-audit --no-fund' in frontend directory...")
         result = subprocess.run(
             ['npm', 'install', '--force', '--no-audit', '--no-fund', '--loglevel=error'],
             cwd=frontend_dir,
-            stdout=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
             stderr=subprocess.PIPE,
             text=True,
             check=False
@@ -410,7 +448,7 @@ def install_frontend_dependencies():
             result = subprocess.run(
                 [npm_cmd, 'install', '--force', '--no-audit', '--no-fund', '--loglevel=error'],
                 cwd=frontend_dir,
-                stdout=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
                 stderr=subprocess.PIPE,
                 text=True,
                 shell=True,
@@ -426,41 +464,34 @@ def install_frontend_dependencies():
             logger.warning(f"Error running npm.cmd install --force: {str(e)}")
         
         # Method 2: Try common npm paths
-        common_paths = [
-            os.path.join(os.environ.get('ProgramFiles', ''), 'nodejs', 'npm.cmd'),
-            os.path.join(os.environ.get('ProgramFiles(x86)', ''), 'nodejs', 'npm.cmd'),
-            os.path.join(os.environ.get('APPDATA', ''), 'npm', 'npm.cmd'),
-            os.path.join(os.environ.get('APPDATA', ''), 'Roaming', 'npm', 'npm.cmd')
-        ]
-        
-        for npm_path in common_paths:
-            if os.path.exists(npm_path):
-                try:
-                    logger.info(f"Running '{npm_path} install --force' in frontend directory...")
-                    
-                    result = subprocess.run(
-                        [npm_path, 'install', '--force', '--no-audit', '--no-fund', '--loglevel=error'],
-                        cwd=frontend_dir,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE,
-                        text=True,
-                        check=False
-                    )
-                    
-                    if result.returncode == 0:
-                        logger.info(f"Frontend dependencies installed successfully using {npm_path}")
-                        return True
-                    else:
-                        logger.warning(f"npm install --force from {npm_path} failed with error: {result.stderr.strip()}")
-                except Exception as e:
-                    logger.warning(f"Error running npm install --force from {npm_path}: {str(e)}")
+        npm_path = _find_npm_windows()
+        if npm_path:
+            try:
+                logger.info(f"Running '{npm_path} install --force' in frontend directory...")
+
+                result = subprocess.run(
+                    [npm_path, 'install', '--force', '--no-audit', '--no-fund', '--loglevel=error'],
+                    cwd=frontend_dir,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                    check=False
+                )
+
+                if result.returncode == 0:
+                    logger.info(f"Frontend dependencies installed successfully using {npm_path}")
+                    return True
+                else:
+                    logger.warning(f"npm install --force from {npm_path} failed with error: {result.stderr.strip()}")
+            except Exception as e:
+                logger.warning(f"Error running npm install --force from {npm_path}: {str(e)}")
         
         # Method 3: Try using where.exe to find npm
         try:
             result = subprocess.run(
                 ['where', 'npm'],
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
                 text=True,
                 check=False
             )
@@ -474,7 +505,7 @@ def install_frontend_dependencies():
                     install_result = subprocess.run(
                         [npm_path, 'install', '--force'],
                         cwd=frontend_dir,
-                        stdout=subprocess.PIPE,
+                        stdout=subprocess.DEVNULL,
                         stderr=subprocess.PIPE,
                         text=True,
                         check=False
@@ -502,7 +533,7 @@ def install_frontend_dependencies():
                 where_result = subprocess.run(
                     ['where', 'npm'],
                     stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
                     text=True,
                     check=False
                 )
@@ -514,10 +545,7 @@ def install_frontend_dependencies():
             
             # Try common locations
             if not npm_cmd:
-                for path in common_paths:
-                    if os.path.exists(path):
-                        npm_cmd = path
-                        break
+                npm_cmd = _find_npm_windows()
             
             # If we found npm, try to install just the missing package
             if npm_cmd:
@@ -526,7 +554,7 @@ def install_frontend_dependencies():
                 install_result = subprocess.run(
                     [npm_cmd, 'install', 'react-bootstrap-icons', '--save', '--no-audit', '--no-fund', '--loglevel=error'],
                     cwd=frontend_dir,
-                    stdout=subprocess.PIPE,
+                    stdout=subprocess.DEVNULL,
                     stderr=subprocess.PIPE,
                     text=True,
                     check=False
@@ -544,15 +572,16 @@ def install_frontend_dependencies():
     return False
 
 def open_browser(url, delay=5):
-    """Open the browser after a delay."""
-    def _open_browser():
-        time.sleep(delay)
-        logger.info(f"Opening browser at {url}")
-        webbrowser.open(url)
-    
-    browser_thread = Thread(target=_open_browser)
-    browser_thread.daemon = True
-    browser_thread.start()
+    """Open the browser after a delay.
+
+    Returns:
+        The started Timer so callers can cancel it on early shutdown
+    """
+    logger.info(f"Browser will open at {url} in {delay} seconds")
+    browser_timer = Timer(delay, webbrowser.open, args=(url,))
+    browser_timer.daemon = True
+    browser_timer.start()
+    return browser_timer
 
 def main():
     """Main entry point for the script."""
@@ -590,9 +619,10 @@ def main():
         return 1
     
     # Open browser
+    browser_timer = None
     if not args.no_browser:
         frontend_url = f"http://localhost:{args.frontend_port}"
-        open_browser(frontend_url)
+        browser_timer = open_browser(frontend_url)
     
     logger.info("Web UI is now running")
     logger.info(f"API server: http://{args.api_host}:{args.api_port}/api")
@@ -605,7 +635,9 @@ def main():
     except KeyboardInterrupt:
         logger.info("Shutting down...")
     finally:
-        # Terminate processes
+        # Cancel the pending browser launch and terminate processes
+        if browser_timer:
+            browser_timer.cancel()
         if api_process:
             api_process.terminate()
         if frontend_process:
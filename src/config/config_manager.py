@@ -5,19 +5,75 @@ This module handles loading, validating, and managing configuration settings
 for the Active Directory Security Assessment Agent.
 """
 
+import copy
+import functools
 import logging
+from contextlib import contextmanager
 import os
 import json
 import socket
+import sys
+import types
 from typing import Dict, Any, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Sentinel for flat-index misses, to distinguish stored None values
+_MISSING = object()
+
+# Default configuration template, built once at import time
+_DEFAULT_CONFIG = {
+    'domain': '',
+    'server': '',
+    'username': '',
+    'password': '',
+    'use_ssl': True,
+    'verify_ssl': True,
+    'port': 636,  # Default LDAPS port
+    'sct_baselines_path': 'baselines',
+    'max_computers_to_assess': 100,
+    'assessment_timeout': 3600,  # 1 hour
+    'report': types.MappingProxyType({
+        'company_name': '',
+        'logo_path': '',
+        'include_recommendations': True,
+        'include_charts': True,
+        'include_executive_summary': True
+    })
+}
+# Read-only view handed out to instances
+_DEFAULT_CONFIG_VIEW = types.MappingProxyType(_DEFAULT_CONFIG)
+
+# Directories already created this process, to skip repeated makedirs syscalls
+_ensured_dirs = set()
+
+def _ensure_dir(path: str) -> None:
+    """Create a directory once per process, skipping the syscall on later calls."""
+    if path and path not in _ensured_dirs:
+        os.makedirs(path, exist_ok=True)
+        _ensured_dirs.add(path)
+
+@functools.lru_cache(maxsize=1)
+def _autodetect_domain() -> str:
+    """Determine the local domain from the FQDN, caching the DNS lookup."""
+    try:
+        return socket.getfqdn().split('.', 1)[1]
+    except (IndexError, socket.error):
+        return ''
+
 class ConfigManager:
     """
     Manages configuration settings for the application.
     """
-    
+
+    # Process-wide cache of parsed configs keyed on (path, mtime_ns, size)
+    _cache: Dict[tuple, Dict[str, Any]] = {}
+
     def __init__(self, config_path: str):
         """
         Initialize the configuration manager.
@@ -26,29 +82,26 @@ class ConfigManager:
             config_path: Path to the configuration file
         """
         self.config_path = config_path
-        self.config = {}
-        self.default_config = {
-            'domain': '',
-            'server': '',
-            'username': '',
-            'password': '',
-            'use_ssl': True,
-            'verify_ssl': True,
-            'port': 636,  # Default LDAPS port
-            'sct_baselines_path': 'baselines',
-            'max_computers_to_assess': 100,
-            'assessment_timeout': 3600,  # 1 hour
-            'report': {
-                'company_name': '',
-                'logo_path': '',
-                'include_recommendations': True,
-                'include_charts': True,
-                'include_executive_summary': True
-            }
-        }
-        
+        self._config: Optional[Dict[str, Any]] = None
+        self._path_cache: Dict[str, tuple] = {}
+        self._flat: Dict[str, Any] = {}
+        self._dirty = False
+        self._batching = 0
+        self.default_config = _DEFAULT_CONFIG_VIEW
+
         logger.debug(f"Initialized configuration manager with config path: {config_path}")
-    
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Current configuration, loaded from file on first access."""
+        if self._config is None:
+            return self.load_config()
+        return self._config
+
+    @config.setter
+    def config(self, value: Dict[str, Any]) -> None:
+        self._config = value
+
     def load_config(self) -> Dict[str, Any]:
         """
         Load configuration from file.
@@ -56,15 +109,32 @@ class ConfigManager:
         Returns:
             Dictionary containing configuration settings
         """
-        # Start with default configuration
-        self.config = self.default_config.copy()
-        
+        # Serve unchanged files from the process-wide cache
+        cache_key = self._cache_key()
+        if cache_key is not None:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"Using cached configuration for {self.config_path}")
+                self.config = copy.deepcopy(cached)
+                self._rebuild_flat()
+                return self.config
+
+        # Start with a writable deep copy of the default configuration
+        self.config = {key: dict(value) if isinstance(value, types.MappingProxyType) else value
+                       for key, value in _DEFAULT_CONFIG.items()}
+
         # Try to load configuration from file
         if os.path.exists(self.config_path):
             try:
-                with open(self.config_path, 'r') as f:
-                    file_config = json.load(f)
-                
+                # Read the whole file in one shot; loads over a bytes buffer
+                # is faster than json.load's incremental file-object reads
+                with open(self.config_path, 'rb') as f:
+                    raw = f.read()
+                if orjson is not None:
+                    file_config = orjson.loads(raw)
+                else:
+                    file_config = json.loads(raw)
+
                 # Update configuration with values from file
                 self._update_config_recursive(self.config, file_config)
                 
@@ -82,8 +152,41 @@ class ConfigManager:
         
         # Validate and fill in missing values
         self._validate_and_fill_config()
-        
+
+        # Cache the fully merged config for subsequent loads
+        cache_key = self._cache_key()
+        if cache_key is not None:
+            self._cache[cache_key] = copy.deepcopy(self.config)
+
+        self._rebuild_flat()
+
         return self.config
+
+    def _rebuild_flat(self) -> None:
+        """Rebuild the flat dotted-key index over the current config."""
+        flat: Dict[str, Any] = {}
+        stack = [('', self._config or {})]
+        while stack:
+            prefix, node = stack.pop()
+            for key, value in node.items():
+                dotted = f"{prefix}{key}"
+                flat[dotted] = value
+                if isinstance(value, dict):
+                    stack.append((f"{dotted}.", value))
+        self._flat = flat
+
+    def _cache_key(self) -> Optional[tuple]:
+        """
+        Build the cache key for the current on-disk config file.
+
+        Returns:
+            Tuple of (path, mtime_ns, size) or None if the file cannot be statted
+        """
+        try:
+            st = os.stat(self.config_path)
+            return (self.config_path, st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
         
     def get_config(self) -> Dict[str, Any]:
         """
@@ -92,34 +195,42 @@ class ConfigManager:
         Returns:
             Dictionary containing configuration settings
         """
-        if not self.config:
+        if not self._config:
             return self.load_config()
-        return self.config
+        return self._config
     
     def _update_config_recursive(self, target: Dict[str, Any], source: Dict[str, Any]) -> None:
         """
-        Recursively update configuration dictionary.
-        
+        Update configuration dictionary, merging nested dictionaries.
+
+        Uses an explicit stack instead of recursion to avoid per-level
+        function call overhead on deeply nested configs.
+
         Args:
             target: Target dictionary to update
             source: Source dictionary with new values
         """
-        for key, value in source.items():
-            if key in target and isinstance(target[key], dict) and isinstance(value, dict):
-                # Recursively update nested dictionaries
-                self._update_config_recursive(target[key], value)
-            else:
-                # Update value
-                target[key] = value
+        _isinstance, _dict = isinstance, dict
+        stack = [(target, source)]
+        while stack:
+            tgt, src = stack.pop()
+            for key, value in src.items():
+                if key in tgt and _isinstance(tgt[key], _dict) and _isinstance(value, _dict):
+                    # Merge nested dictionaries
+                    stack.append((tgt[key], value))
+                else:
+                    # Update value
+                    tgt[key] = value
     
     def _validate_and_fill_config(self) -> None:
         """Validate configuration and fill in missing values."""
         # Try to determine domain if not provided
         if not self.config.get('domain'):
-            try:
-                self.config['domain'] = socket.getfqdn().split('.', 1)[1]
-                logger.info(f"Automatically determined domain: {self.config['domain']}")
-            except (IndexError, socket.error):
+            domain = _autodetect_domain()
+            if domain:
+                self.config['domain'] = domain
+                logger.info(f"Automatically determined domain: {domain}")
+            else:
                 logger.warning("Could not automatically determine domain")
         
         # Try to determine server if not provided
@@ -136,24 +247,55 @@ class ConfigManager:
         
         # Ensure baselines directory exists
         baselines_path = self.config.get('sct_baselines_path', 'baselines')
-        os.makedirs(baselines_path, exist_ok=True)
+        _ensure_dir(baselines_path)
     
-    def save_config(self) -> bool:
+    @contextmanager
+    def batch(self):
+        """
+        Defer saves while applying several updates.
+
+        Saves at most once when the outermost batch exits, instead of
+        rewriting the file for every mutation.
+        """
+        self._batching += 1
+        try:
+            yield self
+        finally:
+            self._batching -= 1
+            if self._batching == 0 and self._dirty:
+                self.save_config()
+
+    def save_config(self, force: bool = False) -> bool:
         """
         Save current configuration to file.
-        
+
+        Args:
+            force: Write even while a batch() block is active
+
         Returns:
-            True if successful, False otherwise
+            True if successful (or deferred by an active batch), False otherwise
         """
+        if self._batching and not force:
+            self._dirty = True
+            return True
+
         try:
             # Create directory if it doesn't exist
-            config_dir = os.path.dirname(self.config_path)
-            if config_dir and not os.path.exists(config_dir):
-                os.makedirs(config_dir, exist_ok=True)
-            
-            with open(self.config_path, 'w') as f:
-                json.dump(self.config, f, indent=2)
-            
+            _ensure_dir(os.path.dirname(self.config_path))
+
+            if orjson is not None:
+                with open(self.config_path, 'wb') as f:
+                    f.write(orjson.dumps(self.config, option=orjson.OPT_INDENT_2))
+            else:
+                with open(self.config_path, 'w') as f:
+                    json.dump(self.config, f, indent=2)
+
+            # Refresh the cache entry for the file just written
+            cache_key = self._cache_key()
+            if cache_key is not None:
+                self._cache[cache_key] = copy.deepcopy(self.config)
+
+            self._dirty = False
             logger.info(f"Saved configuration to {self.config_path}")
             return True
             
@@ -173,12 +315,32 @@ class ConfigManager:
         """
         self._update_config_recursive(self.config, new_config)
         self._validate_and_fill_config()
-        
-        # Save updated configuration
+        self._rebuild_flat()
+        self._dirty = True
+
+        # Save updated configuration (deferred while batching)
         self.save_config()
-        
+
         return self.config
     
+    def _split(self, key: str) -> tuple:
+        """
+        Split a dotted key into its parts, caching the result.
+
+        Parts are interned so nested dict lookups hash by pointer.
+
+        Args:
+            key: Configuration key (can use dot notation for nested keys)
+
+        Returns:
+            Tuple of key parts
+        """
+        parts = self._path_cache.get(key)
+        if parts is None:
+            parts = tuple(sys.intern(part) for part in key.split('.'))
+            self._path_cache[key] = parts
+        return parts
+
     def get_value(self, key: str, default: Any = None) -> Any:
         """
         Get a configuration value.
@@ -190,19 +352,42 @@ class ConfigManager:
         Returns:
             Configuration value or default if not found
         """
-        # Handle nested keys with dot notation
-        if '.' in key:
-            parts = key.split('.')
-            value = self.config
-            for part in parts:
-                if isinstance(value, dict) and part in value:
-                    value = value[part]
-                else:
-                    return default
+        # Fast path: single hash lookup in the flat dotted-key index
+        value = self._flat.get(key, _MISSING)
+        if value is not _MISSING:
             return value
-        
+
+        parts = self._split(key)
+
         # Simple key
-        return self.config.get(key, default)
+        if len(parts) == 1:
+            return self.config.get(key, default)
+
+        # Nested key with dot notation
+        value = self._walk(self.config, parts, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        # Layer the frozen defaults under the loaded config, ChainMap-style,
+        # so keys added to the template after a config file was saved still
+        # resolve without re-merging
+        value = self._walk(_DEFAULT_CONFIG, parts, _MISSING)
+        return default if value is _MISSING else value
+
+    @staticmethod
+    def _walk(node: Any, parts: tuple, default: Any) -> Any:
+        """Descend through nested mappings following the given key parts.
+
+        Uses bare __getitem__ with exception handling instead of
+        isinstance/membership tests, so each level costs a single
+        C-level dict lookup.
+        """
+        try:
+            for part in parts:
+                node = node[part]
+        except (KeyError, TypeError):
+            return default
+        return node
     
     def set_value(self, key: str, value: Any) -> None:
         """
@@ -212,15 +397,24 @@ class ConfigManager:
             key: Configuration key (can use dot notation for nested keys)
             value: Value to set
         """
-        # Handle nested keys with dot notation
-        if '.' in key:
-            parts = key.split('.')
+        parts = self._split(key)
+        self._dirty = True
+
+        # Simple key
+        if len(parts) == 1:
+            self.config[key] = value
+        else:
+            # Nested key with dot notation
             config = self.config
             for part in parts[:-1]:
                 if part not in config:
                     config[part] = {}
                 config = config[part]
             config[parts[-1]] = value
+
+        # Keep the flat index in sync: patch leaf overwrites directly,
+        # rebuild when the shape of the tree may have changed
+        if not isinstance(value, dict) and key in self._flat:
+            self._flat[key] = value
         else:
-            # Simple key
-            self.config[key] = value
+            self._rebuild_flat()
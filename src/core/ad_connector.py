@@ -4,21 +4,143 @@ Active Directory Connector Module
 This module handles secure connections to Active Directory and data retrieval.
 """
 
+import functools
+import json
 import logging
-import ldap3
-from ldap3 import Server, Connection, ALL, NTLM, SUBTREE
-from ldap3.core.exceptions import LDAPException
-import ssl
+import os
+import time
+from types import MappingProxyType
 from typing import Dict, List, Any, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# ldap3 and ssl are imported lazily on the first real connection attempt:
+# mock-mode runs and --help invocations never pay for pulling in ldap3's
+# dependency tree (pyasn1 and friends) at interpreter start
+ldap3 = None
+Server = Connection = NONE = NTLM = SUBTREE = None
+ssl = None
+
+
+class LDAPException(Exception):
+    """Placeholder so except clauses resolve before ldap3 is loaded.
+
+    Replaced by ldap3's real exception class when _load_ldap3() runs, which
+    always happens before any ldap3 call that could raise it.
+    """
+
+
+def _load_ldap3() -> None:
+    """Import ldap3 and ssl on first use, populating the module globals."""
+    global ldap3, Server, Connection, NONE, NTLM, SUBTREE, LDAPException, ssl
+    if ldap3 is None:
+        import ssl as _ssl
+        import ldap3 as _ldap3
+        from ldap3.core.exceptions import LDAPException as _LDAPException
+        ssl = _ssl
+        ldap3 = _ldap3
+        Server = _ldap3.Server
+        Connection = _ldap3.Connection
+        NONE = _ldap3.NONE
+        NTLM = _ldap3.NTLM
+        SUBTREE = _ldap3.SUBTREE
+        LDAPException = _LDAPException
+
+# Ordered (marker substring, mock category) dispatch table; the DC marker
+# must come first because its filter also contains objectClass=computer
+_FILTER_DISPATCH = (
+    ('(userAccountControl:1.2.840.113556.1.4.803:=8192)', 'dc'),
+    ('(objectClass=computer)', 'computers'),
+    ('(objectClass=user)', 'users'),
+    ('(objectClass=group)', 'groups'),
+    ('(objectClass=groupPolicyContainer)', 'gpos'),
+    ('(objectClass=domainDNS)', 'pwpolicy'),
+)
+
+# The exact filters issued by the get_* methods. Keyed on
+# (length, 16th character), which is unique across all six, so the common
+# case classifies with one dict probe plus an equality check instead of up
+# to six substring scans over the filter
+_KNOWN_FILTERS = (
+    ('(&(objectClass=computer)(userAccountControl:1.2.840.113556.1.4.803:=8192))', 'dc'),
+    ('(objectClass=computer)', 'computers'),
+    ('(objectClass=user)', 'users'),
+    ('(objectClass=group)', 'groups'),
+    ('(objectClass=groupPolicyContainer)', 'gpos'),
+    ('(objectClass=domainDNS)', 'pwpolicy'),
+)
+_FAST_DISPATCH = {(len(f), f[15]): (f, category) for f, category in _KNOWN_FILTERS}
+
+# Per-category inventory queries: (filter, attributes) issued by the
+# individual getters in mock mode and used to project union-search entries
+# into their category shapes
+_DC_FILTER = '(&(objectClass=computer)(userAccountControl:1.2.840.113556.1.4.803:=8192))'
+_DC_ATTRIBUTES = ('name', 'dNSHostName', 'operatingSystem', 'operatingSystemVersion')
+_INVENTORY_QUERIES = MappingProxyType({
+    'computers': ('(objectClass=computer)',
+                  ('name', 'dNSHostName', 'operatingSystem', 'operatingSystemVersion',
+                   'lastLogonTimestamp', 'whenCreated')),
+    'users': ('(objectClass=user)',
+              ('sAMAccountName', 'userPrincipalName', 'displayName', 'mail',
+               'pwdLastSet', 'userAccountControl', 'lastLogonTimestamp', 'memberOf')),
+    'groups': ('(objectClass=group)',
+               ('sAMAccountName', 'description', 'member', 'groupType')),
+    'gpos': ('(objectClass=groupPolicyContainer)',
+             ('displayName', 'gPCFileSysPath', 'whenCreated', 'whenChanged')),
+})
+
+# One OR-filter search covering every inventory category: the server
+# traverses the tree once and we partition client-side by objectClass
+_UNION_FILTER = ('(|(objectClass=computer)(objectClass=user)'
+                 '(objectClass=group)(objectClass=groupPolicyContainer))')
+_UNION_ATTRIBUTES = tuple(sorted(
+    {'objectClass', 'userAccountControl'}.union(
+        *(attrs for _, attrs in _INVENTORY_QUERIES.values()))
+))
+
+# userAccountControl bit marking a domain controller (SERVER_TRUST_ACCOUNT)
+_UF_SERVER_TRUST_ACCOUNT = 0x2000
+
+# Bounds for the per-connector search result cache
+_SEARCH_CACHE_SIZE = 64
+_SEARCH_CACHE_TTL = 300.0  # seconds
+
+# Mock payload templates live in _mock_fixtures.json next to this module,
+# keeping fixture data out of the code and its bytecode; the file is parsed
+# once at import by the C-level json loader and frozen read-only. String
+# values may contain {domain} and {base_dn} placeholders that are filled in
+# per connector by _build_mock.
+_FIXTURES_PATH = os.path.join(os.path.dirname(__file__), '_mock_fixtures.json')
+
+
+def _load_mock_templates():
+    """Load and freeze the mock payload templates from the fixtures file."""
+    with open(_FIXTURES_PATH, 'rb') as f:
+        raw = json.load(f)
+    return MappingProxyType({
+        category: tuple(MappingProxyType(entry) for entry in entries)
+        for category, entries in raw.items()
+    })
+
+
+_MOCK_TEMPLATES = _load_mock_templates()
+
 class ADConnector:
     """
     Handles connections to Active Directory and data retrieval operations.
     Uses secure LDAP (LDAPS) for encrypted communications.
     """
-    
+
+    # Slots instead of a per-instance __dict__: attribute access becomes a
+    # fixed-offset load and each connector is a few hundred bytes lighter,
+    # which adds up when assessing several domains at once
+    __slots__ = (
+        'config', 'domain', 'server_host', 'username', 'password',
+        'use_ssl', 'port', 'verify_ssl', 'mock_mode', '_domain_parts',
+        'base_dn', 'connection', 'server', '_tls', '_pending_attrs',
+        '_pending_mock', '_mock_msg_id', '_inventory', '_search_cache',
+    )
+
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize the AD connector with configuration settings.
@@ -50,9 +172,21 @@ class ADConnector:
             self.mock_mode = True
             self.domain = "example.com"  # Set a default domain for mock mode
         
+        self._domain_parts = self.domain.split('.') if self.domain else []
         self.base_dn = self._get_base_dn_from_domain(self.domain) if self.domain else ""
         self.connection = None
         self.server = None
+        self._tls = None
+        # Outstanding async searches: attribute lists keyed by message id,
+        # plus pre-built results for mock-mode submissions (negative ids)
+        self._pending_attrs: Dict[int, List[str]] = {}
+        self._pending_mock: Dict[int, List[Dict[str, Any]]] = {}
+        self._mock_msg_id = 0
+        # Inventory from get_all(), cached until disconnect()
+        self._inventory: Optional[Dict[str, List[Dict[str, Any]]]] = None
+        # Search results keyed by (filter, attributes, base), each stored
+        # with its expiry time; repeated getter calls skip the network
+        self._search_cache: Dict[tuple, tuple] = {}
         
         if self.mock_mode:
             logger.info("Running in mock mode - no actual AD connection will be made")
@@ -87,6 +221,15 @@ class ADConnector:
             return True
             
         try:
+            _load_ldap3()
+
+            # Reuse an existing bound connection: skipping the reconnect
+            # avoids repeating the TLS handshake entirely, which is the
+            # most expensive part of establishing the session
+            if self.connection is not None and self.connection.bound:
+                logger.debug("Reusing existing bound connection")
+                return True
+
             # Check if required connection parameters are provided
             if not self.domain or not self.server_host:
                 logger.error("Domain and server host are required for AD connection")
@@ -97,20 +240,68 @@ class ADConnector:
             if not self.username or not self.password:
                 logger.warning("No credentials provided, attempting anonymous bind")
                 
-            # Configure TLS if using SSL
+            # Configure TLS if using SSL; the Tls object is built once per
+            # connector and reused, so reconnects share its SSL settings.
+            # ldap3 manages its own SSLContext internally, so OS-level
+            # session resumption is the library's concern, not ours;
+            # persisting TLS sessions to disk for cross-process reuse
+            # would additionally need pyOpenSSL's session serialization
+            # (the stdlib ssl module cannot serialize SSLSession objects)
+            # and is deliberately not attempted here
             tls_config = None
             if self.use_ssl:
-                tls_config = ldap3.Tls(validate=ssl.CERT_REQUIRED if self.verify_ssl else ssl.CERT_NONE)
-            
-            # Create server object
-            self.server = Server(
-                self.server_host,
-                port=self.port,
-                use_ssl=self.use_ssl,
-                tls=tls_config,
-                get_info=ALL
-            )
+                if self._tls is None:
+                    self._tls = ldap3.Tls(validate=ssl.CERT_REQUIRED if self.verify_ssl else ssl.CERT_NONE)
+                tls_config = self._tls
+
+            # Create server object once; a reconnect reuses it along with
+            # any DSE/schema info it already fetched. A list of hosts
+            # becomes a round-robin pool so searches spread across DC
+            # replicas and a DC outage fails over instead of killing the
+            # connection
+            if self.server is None:
+                # Skip the DSE/schema download on connect unless a caller
+                # explicitly asks for it; nothing here reads the schema and
+                # fetching it costs megabytes over TLS on every bind
+                get_info = self.config.get('get_info', NONE)
+                if isinstance(self.server_host, (list, tuple)):
+                    servers = [
+                        Server(host, port=self.port, use_ssl=self.use_ssl,
+                               tls=tls_config, get_info=get_info)
+                        for host in self.server_host
+                    ]
+                    self.server = ldap3.ServerPool(servers, ldap3.ROUND_ROBIN,
+                                                   active=True, exhaust=False)
+                else:
+                    self.server = Server(
+                        self.server_host,
+                        port=self.port,
+                        use_ssl=self.use_ssl,
+                        tls=tls_config,
+                        get_info=get_info
+                    )
             
+            # Prefer Kerberos (SASL/GSSAPI) when a ticket is available: the
+            # OS-cached ticket replaces NTLM's per-connect challenge/response
+            # and no password needs to be transported. Ordering is
+            # Kerberos > NTLM > anonymous.
+            auth = self.config.get('auth')
+            if auth == 'kerberos' or (auth is None and os.environ.get('KRB5CCNAME')):
+                try:
+                    self.connection = Connection(
+                        self.server,
+                        authentication=ldap3.SASL,
+                        sasl_mechanism=ldap3.GSSAPI,
+                        auto_bind=True,
+                        client_strategy=ldap3.REUSABLE,
+                        pool_size=5,
+                        receive_timeout=30  # 30 seconds timeout
+                    )
+                    logger.info(f"Successfully connected to {self.server_host} via Kerberos")
+                    return True
+                except LDAPException as e:
+                    logger.warning(f"Kerberos bind failed, falling back to NTLM: {str(e)}")
+
             # Create connection object with timeout settings
             self.connection = Connection(
                 self.server,
@@ -118,26 +309,19 @@ class ADConnector:
                 password=self.password,
                 authentication=NTLM if self.username and self.password else None,
                 auto_bind=True,
+                client_strategy=ldap3.REUSABLE,
+                pool_size=5,
                 receive_timeout=30  # 30 seconds timeout
             )
             
             logger.info(f"Successfully connected to {self.server_host}")
             return True
             
-        except LDAPException as e:
-            logger.error(f"Failed to connect to AD server: {str(e)}")
-            logger.info("Enabling mock mode due to LDAP connection error")
-            self.mock_mode = True
-            return True
-        except ConnectionError as e:
-            logger.error(f"Network error connecting to AD server: {str(e)}")
-            logger.info("Enabling mock mode due to network error")
-            self.mock_mode = True
-            return True
-        except OSError as e:
-            # Handle socket errors and other OS-level errors
-            logger.error(f"Socket error connecting to AD server: {str(e)}")
-            logger.info("Enabling mock mode due to socket error")
+        except (LDAPException, ConnectionError, OSError) as e:
+            # LDAP, network and socket failures all take the same fallback;
+            # the exception class name keeps the diagnostics equivalent
+            logger.error(f"{type(e).__name__} connecting to AD server: {str(e)}")
+            logger.info("Enabling mock mode due to connection error")
             self.mock_mode = True
             return True
         except Exception as e:
@@ -147,175 +331,134 @@ class ADConnector:
             return True
     
     def disconnect(self) -> None:
-        """Close the LDAP connection."""
+        """Close the LDAP connection and drop results cached from it."""
+        self._inventory = None
+        self._search_cache.clear()
         if self.connection and self.connection.bound:
             self.connection.unbind()
             logger.debug("Disconnected from AD server")
+
+    def __enter__(self) -> 'ADConnector':
+        """Bind once for the lifetime of the block; searches reuse the connection."""
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Unbind the connection when the block exits."""
+        self.disconnect()
     
+    def _classify_filter(self, search_filter: str) -> Optional[str]:
+        """
+        Classify an LDAP search filter into a mock data category.
+
+        Args:
+            search_filter: LDAP search filter
+
+        Returns:
+            Category name or None if the filter is not recognized
+        """
+        # Fast path: O(1) probe for the filters the get_* methods issue,
+        # with an equality check to rule out key collisions
+        if len(search_filter) > 15:
+            hit = _FAST_DISPATCH.get((len(search_filter), search_filter[15]))
+            if hit is not None and hit[0] == search_filter:
+                return hit[1]
+
+        for marker, category in _FILTER_DISPATCH:
+            if marker in search_filter:
+                return category
+        return None
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _build_mock(domain: str, base_dn: str, category: str) -> List[Dict[str, Any]]:
+        """
+        Build the mock payload for a filter category from the frozen templates.
+
+        Only the domain-interpolated fields are formatted; everything else is
+        taken straight from the shared module-level templates. Results are
+        memoized per (domain, base_dn, category) so repeated mock searches
+        return the already-built list.
+
+        Args:
+            domain: AD domain name
+            base_dn: Base DN derived from the domain
+            category: Filter category from _classify_filter
+
+        Returns:
+            List of dictionaries containing mock data
+        """
+        templates = _MOCK_TEMPLATES.get(category)
+        if templates is None:
+            return []
+
+        subs = {'domain': domain, 'base_dn': base_dn}
+        results = []
+        for template in templates:
+            entry = {}
+            for key, value in template.items():
+                if isinstance(value, str):
+                    if '{' in value:
+                        value = value.format_map(subs)
+                elif isinstance(value, list):
+                    value = [item.format_map(subs) if '{' in item else item
+                             for item in value]
+                entry[key] = value
+            results.append(entry)
+        return results
+
     def _get_mock_data(self, search_filter: str, attributes: List[str]) -> List[Dict[str, Any]]:
         """
         Generate mock data for different search filters.
-        
+
         Args:
             search_filter: LDAP search filter
             attributes: List of attributes to retrieve
-            
+
         Returns:
             List of dictionaries containing mock data
         """
         logger.debug(f"Generating mock data for filter: {search_filter}")
-        
-        # Domain controllers
-        if '(userAccountControl:1.2.840.113556.1.4.803:=8192)' in search_filter:
-            return [
-                {
-                    'name': 'DC01',
-                    'dNSHostName': f'dc01.{self.domain}',
-                    'operatingSystem': 'Windows Server 2019',
-                    'operatingSystemVersion': '10.0 (17763)'
-                },
-                {
-                    'name': 'DC02',
-                    'dNSHostName': f'dc02.{self.domain}',
-                    'operatingSystem': 'Windows Server 2016',
-                    'operatingSystemVersion': '10.0 (14393)'
-                }
-            ]
-        
-        # Computers
-        elif '(objectClass=computer)' in search_filter and 'userAccountControl' not in search_filter:
-            return [
-                {
-                    'name': 'DC01',
-                    'dNSHostName': f'dc01.{self.domain}',
-                    'operatingSystem': 'Windows Server 2019',
-                    'operatingSystemVersion': '10.0 (17763)',
-                    'lastLogonTimestamp': '132953620000000000',
-                    'whenCreated': '20210101000000.0Z'
-                },
-                {
-                    'name': 'DC02',
-                    'dNSHostName': f'dc02.{self.domain}',
-                    'operatingSystem': 'Windows Server 2016',
-                    'operatingSystemVersion': '10.0 (14393)',
-                    'lastLogonTimestamp': '132953620000000000',
-                    'whenCreated': '20210101000000.0Z'
-                },
-                {
-                    'name': 'CLIENT01',
-                    'dNSHostName': f'client01.{self.domain}',
-                    'operatingSystem': 'Windows 10 Enterprise',
-                    'operatingSystemVersion': '10.0 (19044)',
-                    'lastLogonTimestamp': '132953620000000000',
-                    'whenCreated': '20210101000000.0Z'
-                },
-                {
-                    'name': 'CLIENT02',
-                    'dNSHostName': f'client02.{self.domain}',
-                    'operatingSystem': 'Windows 11 Enterprise',
-                    'operatingSystemVersion': '10.0 (22000)',
-                    'lastLogonTimestamp': '132953620000000000',
-                    'whenCreated': '20220101000000.0Z'
-                }
-            ]
-        
-        # Users
-        elif '(objectClass=user)' in search_filter:
-            return [
-                {
-                    'sAMAccountName': 'administrator',
-                    'userPrincipalName': f'administrator@{self.domain}',
-                    'displayName': 'Administrator',
-                    'mail': f'administrator@{self.domain}',
-                    'pwdLastSet': '132953620000000000',
-                    'userAccountControl': 512,
-                    'lastLogonTimestamp': '132953620000000000',
-                    'memberOf': [f'CN=Domain Admins,CN=Users,DC={self.domain.split(".")[0]},DC={self.domain.split(".")[1]}']
-                },
-                {
-                    'sAMAccountName': 'user1',
-                    'userPrincipalName': f'user1@{self.domain}',
-                    'displayName': 'User One',
-                    'mail': f'user1@{self.domain}',
-                    'pwdLastSet': '132953620000000000',
-                    'userAccountControl': 512,
-                    'lastLogonTimestamp': '132953620000000000',
-                    'memberOf': [f'CN=Domain Users,CN=Users,DC={self.domain.split(".")[0]},DC={self.domain.split(".")[1]}']
-                }
-            ]
-        
-        # Groups
-        elif '(objectClass=group)' in search_filter:
-            return [
-                {
-                    'sAMAccountName': 'Domain Admins',
-                    'description': 'Designated administrators of the domain',
-                    'member': [f'CN=Administrator,CN=Users,DC={self.domain.split(".")[0]},DC={self.domain.split(".")[1]}'],
-                    'groupType': 2147483652
-                },
-                {
-                    'sAMAccountName': 'Domain Users',
-                    'description': 'All domain users',
-                    'member': [
-                        f'CN=Administrator,CN=Users,DC={self.domain.split(".")[0]},DC={self.domain.split(".")[1]}',
-                        f'CN=User One,CN=Users,DC={self.domain.split(".")[0]},DC={self.domain.split(".")[1]}'
-                    ],
-                    'groupType': 2147483652
-                }
-            ]
-        
-        # GPOs
-        elif '(objectClass=groupPolicyContainer)' in search_filter:
-            return [
-                {
-                    'displayName': 'Default Domain Policy',
-                    'gPCFileSysPath': f'\\\\{self.domain}\\sysvol\\{self.domain}\\Policies\\{{31B2F340-016D-11D2-945F-00C04FB984F9}}',
-                    'whenCreated': '20210101000000.0Z',
-                    'whenChanged': '20210101000000.0Z'
-                },
-                {
-                    'displayName': 'Default Domain Controllers Policy',
-                    'gPCFileSysPath': f'\\\\{self.domain}\\sysvol\\{self.domain}\\Policies\\{{6AC1786C-016F-11D2-945F-00C04FB984F9}}',
-                    'whenCreated': '20210101000000.0Z',
-                    'whenChanged': '20210101000000.0Z'
-                }
-            ]
-        
-        # Domain password policy
-        elif '(objectClass=domainDNS)' in search_filter:
-            return [
-                {
-                    'maxPwdAge': '-864000000000',  # 10 days in 100-nanosecond intervals
-                    'minPwdAge': '-86400000000',   # 1 day in 100-nanosecond intervals
-                    'minPwdLength': 7,
-                    'pwdHistoryLength': 24,
-                    'pwdProperties': 1,
-                    'lockoutThreshold': 0,
-                    'lockoutDuration': '-18000000000'  # 30 minutes in 100-nanosecond intervals
-                }
-            ]
-        
-        # Default: empty result
-        return []
+
+        category = self._classify_filter(search_filter)
+        if category is None:
+            return []
+
+        return self._build_mock(self.domain, self.base_dn, category)
+
     
-    def search(self, search_filter: str, attributes: List[str], 
-               search_base: Optional[str] = None) -> List[Dict[str, Any]]:
+    def search(self, search_filter: str, attributes: List[str],
+               search_base: Optional[str] = None,
+               limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Perform an LDAP search and return the results.
-        
+
         Args:
             search_filter: LDAP search filter
             attributes: List of attributes to retrieve
             search_base: Base DN for the search (defaults to domain base DN)
-            
+            limit: Maximum number of entries to return; enforced server-side
+                so callers that only need the first row don't transfer the rest
+
         Returns:
             List of dictionaries containing the requested attributes
         """
         # If in mock mode, return mock data
         if self.mock_mode:
             logger.info(f"Mock mode: Simulating search with filter: {search_filter}")
-            return self._get_mock_data(search_filter, attributes)
-            
+            results = self._get_mock_data(search_filter, attributes)
+            return results[:limit] if limit else results
+
+        # Serve repeated identical searches from the TTL cache; an
+        # assessment often re-requests the same inventory several times
+        cache_key = (search_filter, tuple(attributes), search_base, limit)
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            if cached[0] > time.monotonic():
+                logger.debug(f"Serving cached results for filter: {search_filter}")
+                return cached[1]
+            del self._search_cache[cache_key]
+
         # Real AD search
         try:
             # Try to connect if not already connected
@@ -328,38 +471,31 @@ class ADConnector:
             base_dn = search_base if search_base else self.base_dn
             
             logger.debug(f"Searching with filter: {search_filter}, base: {base_dn}")
-            self.connection.search(
+            # Stream results page by page instead of materializing the whole
+            # result set; keeps memory bounded on large directories
+            entries = self.connection.extend.standard.paged_search(
                 search_base=base_dn,
                 search_filter=search_filter,
                 search_scope=SUBTREE,
-                attributes=attributes
+                attributes=attributes,
+                paged_size=min(1000, limit) if limit else 1000,
+                size_limit=limit if limit else 0,
+                generator=True
             )
-            
-            results = []
-            for entry in self.connection.entries:
-                result = {}
-                for attr in attributes:
-                    if hasattr(entry, attr):
-                        result[attr] = entry[attr].value
-                results.append(result)
-                
+
+            results = self._entries_to_dicts(entries, attributes, limit)
+
+            # Cache with a TTL, evicting the oldest entry once full
+            if len(self._search_cache) >= _SEARCH_CACHE_SIZE:
+                self._search_cache.pop(next(iter(self._search_cache)))
+            self._search_cache[cache_key] = (time.monotonic() + _SEARCH_CACHE_TTL, results)
+
             logger.debug(f"Found {len(results)} results")
             return results
             
-        except LDAPException as e:
-            logger.error(f"LDAP search error: {str(e)}")
-            logger.warning("LDAP search failed, falling back to mock mode")
-            self.mock_mode = True
-            return self._get_mock_data(search_filter, attributes)
-        except ConnectionError as e:
-            logger.error(f"Connection error during search: {str(e)}")
-            logger.warning("Connection error, falling back to mock mode")
-            self.mock_mode = True
-            return self._get_mock_data(search_filter, attributes)
-        except OSError as e:
-            # Handle socket errors and other OS-level errors
-            logger.error(f"Socket error during search: {str(e)}")
-            logger.warning("Socket error, falling back to mock mode")
+        except (LDAPException, ConnectionError, OSError) as e:
+            logger.error(f"{type(e).__name__} during search: {str(e)}")
+            logger.warning("Search failed, falling back to mock mode")
             self.mock_mode = True
             return self._get_mock_data(search_filter, attributes)
         except Exception as e:
@@ -368,68 +504,238 @@ class ADConnector:
             self.mock_mode = True
             return self._get_mock_data(search_filter, attributes)
     
+    @staticmethod
+    def _entries_to_dicts(entries, attributes: List[str],
+                          limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Convert raw ldap3 response entries into plain attribute dictionaries.
+
+        Args:
+            entries: Iterable of raw response dictionaries from ldap3
+            attributes: List of attributes to extract
+            limit: Stop after this many entries, abandoning the rest
+
+        Returns:
+            List of dictionaries containing the requested attributes
+        """
+        results = []
+        for entry in entries:
+            if limit is not None and len(results) >= limit:
+                break
+            if entry.get('type') != 'searchResEntry':
+                continue
+            attrs = entry['attributes']
+            result = {}
+            for attr in attributes:
+                if attr in attrs:
+                    value = attrs[attr]
+                    # Unwrap single-element lists so callers see scalars,
+                    # matching the .value semantics of ldap3 entry objects
+                    if isinstance(value, list) and len(value) == 1:
+                        value = value[0]
+                    result[attr] = value
+            results.append(result)
+        return results
+
+    def async_search(self, search_filter: str, attributes: List[str],
+                     search_base: Optional[str] = None) -> int:
+        """
+        Submit an LDAP search without waiting for its results.
+
+        Several searches can be outstanding at once, so server-side
+        processing overlaps; collect each one later with await_results().
+
+        Args:
+            search_filter: LDAP search filter
+            attributes: List of attributes to retrieve
+            search_base: Base DN for the search (defaults to domain base DN)
+
+        Returns:
+            Message id to pass to await_results()
+        """
+        if not self.mock_mode and (not self.connection or not self.connection.bound):
+            if not self.connect():
+                logger.warning("Failed to connect to AD server, falling back to mock mode")
+                self.mock_mode = True
+
+        # Mock mode: build the results now under a synthetic negative id
+        # so real server message ids can never collide with it
+        if self.mock_mode:
+            logger.info(f"Mock mode: Simulating async search with filter: {search_filter}")
+            self._mock_msg_id -= 1
+            self._pending_mock[self._mock_msg_id] = self._get_mock_data(search_filter, attributes)
+            return self._mock_msg_id
+
+        base_dn = search_base if search_base else self.base_dn
+        logger.debug(f"Submitting async search with filter: {search_filter}, base: {base_dn}")
+        msg_id = self.connection.search(
+            search_base=base_dn,
+            search_filter=search_filter,
+            search_scope=SUBTREE,
+            attributes=attributes
+        )
+        self._pending_attrs[msg_id] = attributes
+        return msg_id
+
+    def await_results(self, msg_id: int) -> List[Dict[str, Any]]:
+        """
+        Collect the results of a search submitted with async_search().
+
+        Args:
+            msg_id: Message id returned by async_search()
+
+        Returns:
+            List of dictionaries containing the requested attributes
+        """
+        mock_results = self._pending_mock.pop(msg_id, None)
+        if mock_results is not None:
+            return mock_results
+
+        attributes = self._pending_attrs.pop(msg_id, [])
+        try:
+            response, _ = self.connection.get_response(msg_id)
+            return self._entries_to_dicts(response or [], attributes)
+        except LDAPException as e:
+            logger.error(f"LDAP error collecting async search results: {str(e)}")
+            return []
+
+    def get_all(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Retrieve the full domain inventory in a single LDAP search.
+
+        Issues one OR-filter search covering computers, users, groups and
+        GPOs, then partitions the entries client-side by objectClass, so the
+        server traverses the tree once and the five round-trips the
+        individual getters would make collapse into one. The result is
+        cached on the connector until disconnect().
+
+        Returns:
+            Dictionary with 'domain_controllers', 'computers', 'users',
+            'groups' and 'gpos' result lists
+        """
+        if self._inventory is not None:
+            return self._inventory
+
+        if not self.mock_mode:
+            entries = self.search(_UNION_FILTER, list(_UNION_ATTRIBUTES))
+            # search() may have dropped into mock mode on a connection
+            # failure; only partition genuine server entries
+            if not self.mock_mode:
+                self._inventory = self._partition_inventory(entries)
+                return self._inventory
+
+        logger.info("Mock mode: Building full inventory from mock data")
+        inventory = {
+            category: self._get_mock_data(search_filter, list(attributes))
+            for category, (search_filter, attributes) in _INVENTORY_QUERIES.items()
+        }
+        inventory['domain_controllers'] = self._get_mock_data(_DC_FILTER, list(_DC_ATTRIBUTES))
+        self._inventory = inventory
+        return inventory
+
+    @staticmethod
+    def _partition_inventory(entries: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Partition union-search entries into per-category inventory lists.
+
+        Args:
+            entries: Attribute dictionaries from the union search
+
+        Returns:
+            Dictionary mapping category names to projected entry lists
+        """
+        inventory: Dict[str, List[Dict[str, Any]]] = {
+            'domain_controllers': [], 'computers': [], 'users': [], 'groups': [], 'gpos': []
+        }
+        for entry in entries:
+            classes = entry.get('objectClass') or []
+            if isinstance(classes, str):
+                classes = [classes]
+            # Computers carry 'user' in their objectClass chain too, so
+            # test the more specific classes first
+            if 'computer' in classes:
+                category = 'computers'
+            elif 'group' in classes:
+                category = 'groups'
+            elif 'groupPolicyContainer' in classes:
+                category = 'gpos'
+            elif 'user' in classes:
+                category = 'users'
+            else:
+                continue
+
+            attributes = _INVENTORY_QUERIES[category][1]
+            inventory[category].append(
+                {attr: entry[attr] for attr in attributes if attr in entry})
+
+            if category == 'computers':
+                try:
+                    uac = int(entry.get('userAccountControl') or 0)
+                except (TypeError, ValueError):
+                    uac = 0
+                if uac & _UF_SERVER_TRUST_ACCOUNT:
+                    inventory['domain_controllers'].append(
+                        {attr: entry[attr] for attr in _DC_ATTRIBUTES if attr in entry})
+        return inventory
+
     def get_domain_controllers(self) -> List[Dict[str, Any]]:
         """
         Get a list of domain controllers in the domain.
-        
+
         Returns:
             List of dictionaries containing domain controller information
         """
-        search_filter = '(&(objectClass=computer)(userAccountControl:1.2.840.113556.1.4.803:=8192))'
-        attributes = ['name', 'dNSHostName', 'operatingSystem', 'operatingSystemVersion']
-        
-        return self.search(search_filter, attributes)
-    
+        return self.get_all()['domain_controllers']
+
     def get_computers(self) -> List[Dict[str, Any]]:
         """
         Get a list of all computer objects in the domain.
-        
+
         Returns:
             List of dictionaries containing computer information
         """
-        search_filter = '(objectClass=computer)'
-        attributes = ['name', 'dNSHostName', 'operatingSystem', 'operatingSystemVersion', 
-                      'lastLogonTimestamp', 'whenCreated']
-        
-        return self.search(search_filter, attributes)
-    
+        return self.get_all()['computers']
+
     def get_users(self) -> List[Dict[str, Any]]:
         """
         Get a list of all user objects in the domain.
-        
+
         Returns:
             List of dictionaries containing user information
         """
-        search_filter = '(objectClass=user)'
-        attributes = ['sAMAccountName', 'userPrincipalName', 'displayName', 'mail',
-                      'pwdLastSet', 'userAccountControl', 'lastLogonTimestamp', 'memberOf']
-        
-        return self.search(search_filter, attributes)
-    
+        return self.get_all()['users']
+
     def get_groups(self) -> List[Dict[str, Any]]:
         """
         Get a list of all groups in the domain.
-        
+
         Returns:
             List of dictionaries containing group information
         """
-        search_filter = '(objectClass=group)'
-        attributes = ['sAMAccountName', 'description', 'member', 'groupType']
-        
-        return self.search(search_filter, attributes)
-    
+        return self.get_all()['groups']
+
     def get_gpos(self) -> List[Dict[str, Any]]:
         """
         Get a list of all Group Policy Objects in the domain.
-        
+
         Returns:
             List of dictionaries containing GPO information
         """
-        search_filter = '(objectClass=groupPolicyContainer)'
-        attributes = ['displayName', 'gPCFileSysPath', 'whenCreated', 'whenChanged']
-        
-        return self.search(search_filter, attributes)
-    
+        return self.get_all()['gpos']
+
+    def get_all_inventory(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Retrieve the full domain inventory.
+
+        Kept as an alias of get_all() for callers written against the
+        fan-out API; the batched single search made the thread pool that
+        used to live here unnecessary.
+
+        Returns:
+            Dictionary mapping inventory names to their result lists
+        """
+        return self.get_all()
+
     def get_domain_password_policy(self) -> Dict[str, Any]:
         """
         Get the domain password policy.
@@ -440,10 +746,30 @@ class ADConnector:
         search_filter = '(objectClass=domainDNS)'
         attributes = ['maxPwdAge', 'minPwdAge', 'minPwdLength', 'pwdHistoryLength',
                       'pwdProperties', 'lockoutThreshold', 'lockoutDuration']
-        
-        results = self.search(search_filter, attributes)
+
+        # Only the first entry is used, so don't transfer the rest
+        results = self.search(search_filter, attributes, limit=1)
         return results[0] if results else {}
     
+    def get_computer_security_settings_bulk(self, computer_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get security settings for many computers in one call.
+
+        Callers assessing a fleet should use this instead of looping over
+        get_computer_security_settings, so the connector has a single place
+        to batch the retrieval (chunked OR-filter searches) once real
+        remote settings collection is implemented. Mock mode builds each
+        payload locally, and the real path currently returns the same
+        not-implemented placeholder as the per-name method.
+
+        Args:
+            computer_names: Names of the computers to query
+
+        Returns:
+            Dictionary mapping each computer name to its settings payload
+        """
+        return {name: self.get_computer_security_settings(name) for name in computer_names}
+
     def get_computer_security_settings(self, computer_name: str) -> Dict[str, Any]:
         """
         Get security settings for a specific computer.
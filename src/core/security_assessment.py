@@ -6,8 +6,12 @@ with Microsoft Security Configuration Toolkit standards.
 """
 
 import logging
+import operator
 import os
 import json
+import random
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional, Tuple
 import platform
 from datetime import datetime
@@ -18,6 +22,50 @@ from src.utils.os_detector import OSDetector
 
 logger = logging.getLogger(__name__)
 
+# Sort rank per recommendation severity; unknown severities sort last
+_SEVERITY_ORDER = {'high': 0, 'medium': 1, 'low': 2}
+
+# Password policy comparison table: (setting_name, policy_key,
+# baseline_value, minimum threshold, severity). A None threshold means the
+# raw AD value cannot be compared directly and the check reports 'warning'.
+_PASSWORD_POLICY_CHECKS = (
+    ('Minimum password length', 'minPwdLength', '14 characters', 14, 'high'),
+    ('Password history', 'pwdHistoryLength', '24 passwords remembered', 24, 'medium'),
+    ('Maximum password age', 'maxPwdAge', '60 days', None, 'medium'),
+)
+
+# Placeholder comparison results, built once and shared by every machine.
+# Result records are read-only downstream (counted, rendered, serialized),
+# so one set of dicts serves the whole fleet instead of three fresh dicts
+# per assessed machine. A real comparison implementation would build
+# per-machine records here instead.
+_PLACEHOLDER_COMPARISON_RESULTS = [
+    {
+        'setting_name': 'PasswordComplexity',
+        'setting_path': 'Computer Configuration\\Windows Settings\\Security Settings\\Account Policies\\Password Policy',
+        'baseline_value': 'Enabled',
+        'actual_value': 'Enabled',
+        'status': 'pass',
+        'severity': 'high'
+    },
+    {
+        'setting_name': 'MinimumPasswordLength',
+        'setting_path': 'Computer Configuration\\Windows Settings\\Security Settings\\Account Policies\\Password Policy',
+        'baseline_value': '14',
+        'actual_value': '8',
+        'status': 'fail',
+        'severity': 'high'
+    },
+    {
+        'setting_name': 'AccountLockoutThreshold',
+        'setting_path': 'Computer Configuration\\Windows Settings\\Security Settings\\Account Policies\\Account Lockout Policy',
+        'baseline_value': '5',
+        'actual_value': '0',
+        'status': 'fail',
+        'severity': 'high'
+    }
+]
+
 class SecurityAssessment:
     """
     Performs security assessments by comparing Active Directory configurations
@@ -51,8 +99,42 @@ class SecurityAssessment:
             'domain_policies': {},
             'recommendations': []
         }
-        
+        # Baselines memoized per (os, os_version): fleets contain thousands
+        # of machines but only a handful of unique OS/version pairs
+        self._baseline_cache: Dict[Tuple[str, str], Optional[Dict[str, Any]]] = {}
+        # OS/version pairs already warned about for having no baseline, so
+        # a fleet full of the same legacy OS logs the warning once
+        self._warned_missing: set = set()
+
+        # Optional NDJSON streaming: when results_stream_path is set, full
+        # per-machine results go to disk as they are produced and only slim
+        # stubs plus status counters stay in memory, keeping RSS flat on
+        # large fleets
+        self._results_stream_path = config.get('results_stream_path')
+        self._results_stream = None
+        # Status counts accumulated as results are stored, so the summary
+        # never has to re-walk the result lists
+        self._status_counts: Counter = Counter()
+
         logger.debug("Initialized security assessment module")
+
+    def _get_baseline(self, os_info: str, os_version: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up the SCT baseline for an OS, memoizing per (os, version).
+
+        Args:
+            os_info: Operating system name from AD
+            os_version: Operating system version from AD
+
+        Returns:
+            Baseline dictionary or None if no suitable baseline exists
+        """
+        key = (os_info, os_version)
+        if key in self._baseline_cache:
+            return self._baseline_cache[key]
+        baseline = self.sct_parser.get_baseline_for_os(os_info, os_version)
+        self._baseline_cache[key] = baseline
+        return baseline
     
     def run_assessment(self) -> Dict[str, Any]:
         """
@@ -62,8 +144,12 @@ class SecurityAssessment:
             Dictionary containing assessment results
         """
         logger.info("Starting security assessment")
-        
+
         try:
+            if self._results_stream_path:
+                self._results_stream = open(self._results_stream_path, 'w')
+                self.assessment_results['results_stream'] = self._results_stream_path
+
             # Assess domain controllers
             self._assess_domain_controllers()
             
@@ -89,44 +175,155 @@ class SecurityAssessment:
             logger.error(f"Error during security assessment: {str(e)}", exc_info=True)
             self.assessment_results['error'] = str(e)
             return self.assessment_results
+        finally:
+            if self._results_stream is not None:
+                self._results_stream.close()
+                self._results_stream = None
     
+    def _assess_one_machine(self, machine: Dict[str, Any], label: str,
+                            security_settings: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Assess a single machine against the baseline for its OS.
+
+        Args:
+            machine: Computer entry from the AD connector
+            label: Human-readable machine kind for log messages
+            security_settings: Pre-fetched settings payload for this machine
+
+        Returns:
+            Per-machine result entry, or None if no suitable baseline exists
+        """
+        name = machine.get('name', 'Unknown')
+        # %-style args defer formatting to the handler, so a filtered INFO
+        # level skips the string build for every machine
+        logger.info("Assessing %s: %s", label, name)
+
+        # Get OS information
+        os_info = machine.get('operatingSystem', '')
+        os_version = machine.get('operatingSystemVersion', '')
+
+        # Determine appropriate baseline based on OS
+        baseline = self._get_baseline(os_info, os_version)
+
+        if not baseline:
+            # The miss itself is cached in _baseline_cache; warn once per
+            # unique OS instead of once per machine
+            key = (os_info, os_version)
+            if key not in self._warned_missing:
+                self._warned_missing.add(key)
+                logger.warning("No suitable baseline found for %s %s "
+                               "(first seen on %s); skipping machines with this OS",
+                               os_info, os_version, name)
+            return None
+
+        # Compare settings with baseline
+        comparison_results = self._compare_with_baseline(security_settings, baseline)
+
+        return {
+            'name': name,
+            'os': os_info,
+            'os_version': os_version,
+            'baseline_used': baseline.get('name', 'Unknown'),
+            'results': comparison_results
+        }
+
+    def _assess_machines(self, machines: List[Dict[str, Any]], label: str) -> List[Dict[str, Any]]:
+        """
+        Assess a list of machines concurrently.
+
+        The per-machine settings fetch is a network round-trip, so a thread
+        pool overlaps the latencies; results keep the input order and are
+        aggregated after the pool closes, so no locking is needed.
+
+        Args:
+            machines: Computer entries from the AD connector
+            label: Human-readable machine kind for log messages
+
+        Returns:
+            List of per-machine result entries, skipping machines without
+            a suitable baseline
+        """
+        if not machines:
+            return []
+
+        # One bulk fetch for every machine's settings instead of a
+        # round-trip inside each per-machine task
+        names = [machine.get('name', 'Unknown') for machine in machines]
+        settings_by_name = self.ad_connector.get_computer_security_settings_bulk(names)
+
+        max_workers = min(self.config.get('assessment_workers', 16), len(machines))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            entries = list(executor.map(
+                lambda machine: self._assess_one_machine(
+                    machine, label,
+                    settings_by_name.get(machine.get('name', 'Unknown'), {})),
+                machines))
+        return [entry for entry in entries if entry is not None]
+
+    def _finalize_results(self, results: List[Dict[str, Any]],
+                          target: str, reference: str) -> None:
+        """
+        Fold comparison results into the running summary in one pass.
+
+        Updates the status counters and turns failing results into
+        recommendations immediately, so neither the summary nor the
+        recommendation stage has to re-walk the result lists later.
+
+        Args:
+            results: Comparison results for one target
+            target: Recommendation target label (e.g. "Computer: CLIENT01")
+            reference: Baseline reference for the recommendations
+        """
+        self._status_counts.update(result.get('status', '') for result in results)
+        recommendations = self.assessment_results['recommendations']
+        for result in results:
+            if result.get('status') == 'fail':
+                # Bind the fields once instead of repeating .get lookups
+                # while interpolating
+                setting = result.get('setting_name')
+                actual = result.get('actual_value')
+                expected = result.get('baseline_value')
+                recommendations.append({
+                    'target': target,
+                    'setting': setting,
+                    'recommendation': f"Change {setting} from '{actual}' to '{expected}'",
+                    'severity': result.get('severity', 'medium'),
+                    'reference': reference
+                })
+
+    def _store_entries(self, category: str, entries: List[Dict[str, Any]]) -> None:
+        """
+        Store per-machine entries, folding each into the running summary.
+
+        With streaming enabled, the full entry is additionally appended to
+        the NDJSON file and only a results-free stub stays in memory, so
+        peak memory no longer grows with per-machine results.
+
+        Args:
+            category: 'domain_controllers' or 'computers'
+            entries: Per-machine result entries from _assess_machines
+        """
+        target_label = 'Domain Controller' if category == 'domain_controllers' else 'Computer'
+        for entry in entries:
+            self._finalize_results(
+                entry.get('results', []),
+                f"{target_label}: {entry.get('name')}",
+                f"Microsoft Security Baseline for {entry.get('os')} {entry.get('os_version')}")
+
+            if self._results_stream is not None:
+                self._results_stream.write(json.dumps({'category': category, **entry}) + '\n')
+                entry = dict(entry)
+                entry['results'] = []
+            self.assessment_results[category].append(entry)
+
     def _assess_domain_controllers(self) -> None:
         """Assess security of domain controllers."""
         logger.info("Assessing domain controllers")
-        
+
         domain_controllers = self.ad_connector.get_domain_controllers()
-        
-        for dc in domain_controllers:
-            dc_name = dc.get('name', 'Unknown')
-            logger.info(f"Assessing domain controller: {dc_name}")
-            
-            # Get OS information
-            os_info = dc.get('operatingSystem', '')
-            os_version = dc.get('operatingSystemVersion', '')
-            
-            # Determine appropriate baseline based on OS
-            baseline = self.sct_parser.get_baseline_for_os(os_info, os_version)
-            
-            if not baseline:
-                logger.warning(f"No suitable baseline found for {dc_name} running {os_info} {os_version}")
-                continue
-            
-            # Get security settings for this DC
-            # In a real implementation, this would involve connecting to the DC
-            # and retrieving actual security settings
-            security_settings = self.ad_connector.get_computer_security_settings(dc_name)
-            
-            # Compare settings with baseline
-            comparison_results = self._compare_with_baseline(security_settings, baseline)
-            
-            # Add results to assessment
-            self.assessment_results['domain_controllers'].append({
-                'name': dc_name,
-                'os': os_info,
-                'os_version': os_version,
-                'baseline_used': baseline.get('name', 'Unknown'),
-                'results': comparison_results
-            })
+
+        self._store_entries('domain_controllers',
+                            self._assess_machines(domain_controllers, 'domain controller'))
     
     def _assess_computers(self) -> None:
         """Assess security of member computers."""
@@ -135,47 +332,24 @@ class SecurityAssessment:
         # Get all computers excluding domain controllers
         all_computers = self.ad_connector.get_computers()
         domain_controllers = self.ad_connector.get_domain_controllers()
-        dc_names = [dc.get('name', '').lower() for dc in domain_controllers]
-        
-        member_computers = [comp for comp in all_computers 
-                           if comp.get('name', '').lower() not in dc_names]
+        # Set membership makes the per-computer exclusion test O(1)
+        dc_names = {dc.get('name', '').lower() for dc in domain_controllers}
+
+        member_computers = [comp for comp in all_computers
+                            if comp.get('name', '').lower() not in dc_names]
         
         # Sample a subset of computers if there are too many
         max_computers = self.config.get('max_computers_to_assess', 100)
         if len(member_computers) > max_computers:
-            logger.info(f"Sampling {max_computers} computers out of {len(member_computers)}")
-            # In a real implementation, we would use a more sophisticated sampling method
-            member_computers = member_computers[:max_computers]
-        
-        for computer in member_computers:
-            computer_name = computer.get('name', 'Unknown')
-            logger.info(f"Assessing computer: {computer_name}")
-            
-            # Get OS information
-            os_info = computer.get('operatingSystem', '')
-            os_version = computer.get('operatingSystemVersion', '')
-            
-            # Determine appropriate baseline based on OS
-            baseline = self.sct_parser.get_baseline_for_os(os_info, os_version)
-            
-            if not baseline:
-                logger.warning(f"No suitable baseline found for {computer_name} running {os_info} {os_version}")
-                continue
-            
-            # Get security settings for this computer
-            security_settings = self.ad_connector.get_computer_security_settings(computer_name)
-            
-            # Compare settings with baseline
-            comparison_results = self._compare_with_baseline(security_settings, baseline)
-            
-            # Add results to assessment
-            self.assessment_results['computers'].append({
-                'name': computer_name,
-                'os': os_info,
-                'os_version': os_version,
-                'baseline_used': baseline.get('name', 'Unknown'),
-                'results': comparison_results
-            })
+            logger.info("Sampling %d computers out of %d", max_computers, len(member_computers))
+            # Sample uniformly instead of taking the prefix, which would bias
+            # the assessment toward LDAP's return order (often alphabetical);
+            # set sample_seed in config for a reproducible sample
+            rng = random.Random(self.config.get('sample_seed'))
+            member_computers = rng.sample(member_computers, max_computers)
+
+        self._store_entries('computers',
+                            self._assess_machines(member_computers, 'computer'))
     
     def _assess_domain_password_policy(self) -> None:
         """Assess domain password policy."""
@@ -199,6 +373,8 @@ class SecurityAssessment:
             'baseline_used': baseline.get('name', 'Default Password Policy'),
             'results': comparison_results
         }
+        self._finalize_results(comparison_results, "Domain Password Policy",
+                               "Microsoft Security Baseline for Domain Password Policy")
     
     def _assess_gpo_settings(self) -> None:
         """Assess Group Policy Object settings."""
@@ -214,7 +390,7 @@ class SecurityAssessment:
             'gpos': [{'name': gpo.get('displayName', 'Unknown')} for gpo in gpos]
         }
         
-        logger.info(f"Found {len(gpos)} GPOs")
+        logger.info("Found %d GPOs", len(gpos))
     
     def _compare_with_baseline(self, settings: Dict[str, Any], 
                               baseline: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -229,36 +405,10 @@ class SecurityAssessment:
             List of comparison results
         """
         # In a real implementation, this would do a detailed comparison
-        # For now, we'll return a placeholder
+        # For now, we'll return the shared placeholder results
         logger.warning("_compare_with_baseline is not fully implemented")
-        
-        # Simulate some comparison results
-        return [
-            {
-                'setting_name': 'PasswordComplexity',
-                'setting_path': 'Computer Configuration\\Windows Settings\\Security Settings\\Account Policies\\Password Policy',
-                'baseline_value': 'Enabled',
-                'actual_value': 'Enabled',
-                'status': 'pass',
-                'severity': 'high'
-            },
-            {
-                'setting_name': 'MinimumPasswordLength',
-                'setting_path': 'Computer Configuration\\Windows Settings\\Security Settings\\Account Policies\\Password Policy',
-                'baseline_value': '14',
-                'actual_value': '8',
-                'status': 'fail',
-                'severity': 'high'
-            },
-            {
-                'setting_name': 'AccountLockoutThreshold',
-                'setting_path': 'Computer Configuration\\Windows Settings\\Security Settings\\Account Policies\\Account Lockout Policy',
-                'baseline_value': '5',
-                'actual_value': '0',
-                'status': 'fail',
-                'severity': 'high'
-            }
-        ]
+
+        return _PLACEHOLDER_COMPARISON_RESULTS
     
     def _compare_password_policy(self, policy: Dict[str, Any], 
                                baseline: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -275,142 +425,57 @@ class SecurityAssessment:
         # In a real implementation, this would do a detailed comparison
         # For now, we'll return a placeholder
         logger.warning("_compare_password_policy is not fully implemented")
-        
-        # Simulate some comparison results
-        return [
-            {
-                'setting_name': 'Minimum password length',
-                'baseline_value': '14 characters',
-                'actual_value': policy.get('minPwdLength', 'Unknown'),
-                'status': 'fail' if policy.get('minPwdLength', 0) < 14 else 'pass',
-                'severity': 'high'
-            },
-            {
-                'setting_name': 'Password history',
-                'baseline_value': '24 passwords remembered',
-                'actual_value': policy.get('pwdHistoryLength', 'Unknown'),
-                'status': 'fail' if policy.get('pwdHistoryLength', 0) < 24 else 'pass',
-                'severity': 'medium'
-            },
-            {
-                'setting_name': 'Maximum password age',
-                'baseline_value': '60 days',
-                'actual_value': policy.get('maxPwdAge', 'Unknown'),
-                'status': 'warning',  # Would need conversion from AD's format
-                'severity': 'medium'
-            }
-        ]
+
+        # Fetch each policy value once and branch on the local instead of
+        # doing a dict lookup for the status and another for actual_value
+        results = []
+        policy_get = policy.get
+        for name, key, baseline_value, threshold, severity in _PASSWORD_POLICY_CHECKS:
+            value = policy_get(key)
+            if threshold is None:
+                # Would need conversion from AD's format
+                status = 'warning'
+            else:
+                status = 'pass' if value is not None and value >= threshold else 'fail'
+            results.append({
+                'setting_name': name,
+                'baseline_value': baseline_value,
+                'actual_value': value if value is not None else 'Unknown',
+                'status': status,
+                'severity': severity
+            })
+        return results
     
     def _generate_recommendations(self) -> None:
-        """Generate security recommendations based on assessment results."""
-        logger.info("Generating security recommendations")
-        
-        # In a real implementation, this would analyze all results and generate
-        # tailored recommendations. For now, we'll use placeholders.
-        
-        # Check domain controllers
-        for dc in self.assessment_results['domain_controllers']:
-            for result in dc.get('results', []):
-                if result.get('status') == 'fail':
-                    self.assessment_results['recommendations'].append({
-                        'target': f"Domain Controller: {dc.get('name')}",
-                        'setting': result.get('setting_name'),
-                        'recommendation': f"Change {result.get('setting_name')} from '{result.get('actual_value')}' to '{result.get('baseline_value')}'",
-                        'severity': result.get('severity', 'medium'),
-                        'reference': f"Microsoft Security Baseline for {dc.get('os')} {dc.get('os_version')}"
-                    })
-        
-        # Check member computers
-        for computer in self.assessment_results['computers']:
-            for result in computer.get('results', []):
-                if result.get('status') == 'fail':
-                    self.assessment_results['recommendations'].append({
-                        'target': f"Computer: {computer.get('name')}",
-                        'setting': result.get('setting_name'),
-                        'recommendation': f"Change {result.get('setting_name')} from '{result.get('actual_value')}' to '{result.get('baseline_value')}'",
-                        'severity': result.get('severity', 'medium'),
-                        'reference': f"Microsoft Security Baseline for {computer.get('os')} {computer.get('os_version')}"
-                    })
-        
-        # Check domain password policy
-        if 'password_policy' in self.assessment_results['domain_policies']:
-            for result in self.assessment_results['domain_policies']['password_policy'].get('results', []):
-                if result.get('status') == 'fail':
-                    self.assessment_results['recommendations'].append({
-                        'target': "Domain Password Policy",
-                        'setting': result.get('setting_name'),
-                        'recommendation': f"Change {result.get('setting_name')} from '{result.get('actual_value')}' to '{result.get('baseline_value')}'",
-                        'severity': result.get('severity', 'medium'),
-                        'reference': "Microsoft Security Baseline for Domain Password Policy"
-                    })
-        
-        # Sort recommendations by severity
-        severity_order = {'high': 0, 'medium': 1, 'low': 2}
-        self.assessment_results['recommendations'].sort(
-            key=lambda x: severity_order.get(x.get('severity', 'low'), 3)
-        )
-        
-        logger.info(f"Generated {len(self.assessment_results['recommendations'])} recommendations")
+        """Sort the recommendations emitted during the assessment passes."""
+        # Recommendations are generated by _finalize_results as each
+        # target's results are stored; only the severity ordering is left.
+        # Decorate with the rank once per element and sort on it with the
+        # C-level itemgetter instead of calling a lambda per comparison
+        order = _SEVERITY_ORDER
+        decorated = [(order.get(rec.get('severity', 'low'), 3), rec)
+                     for rec in self.assessment_results['recommendations']]
+        decorated.sort(key=operator.itemgetter(0))
+        self.assessment_results['recommendations'] = [rec for _, rec in decorated]
+
+        logger.info("Generated %d recommendations", len(self.assessment_results['recommendations']))
     
     def _update_summary_statistics(self) -> None:
-        """Update summary statistics based on assessment results."""
-        total_checks = 0
-        passed = 0
-        failed = 0
-        warning = 0
-        not_applicable = 0
-        
-        # Count domain controller results
-        for dc in self.assessment_results['domain_controllers']:
-            for result in dc.get('results', []):
-                total_checks += 1
-                status = result.get('status', '')
-                if status == 'pass':
-                    passed += 1
-                elif status == 'fail':
-                    failed += 1
-                elif status == 'warning':
-                    warning += 1
-                elif status == 'not_applicable':
-                    not_applicable += 1
-        
-        # Count member computer results
-        for computer in self.assessment_results['computers']:
-            for result in computer.get('results', []):
-                total_checks += 1
-                status = result.get('status', '')
-                if status == 'pass':
-                    passed += 1
-                elif status == 'fail':
-                    failed += 1
-                elif status == 'warning':
-                    warning += 1
-                elif status == 'not_applicable':
-                    not_applicable += 1
-        
-        # Count domain policy results
-        if 'password_policy' in self.assessment_results['domain_policies']:
-            for result in self.assessment_results['domain_policies']['password_policy'].get('results', []):
-                total_checks += 1
-                status = result.get('status', '')
-                if status == 'pass':
-                    passed += 1
-                elif status == 'fail':
-                    failed += 1
-                elif status == 'warning':
-                    warning += 1
-                elif status == 'not_applicable':
-                    not_applicable += 1
-        
+        """Update summary statistics from the counters kept during assessment."""
+        counts = self._status_counts
+        total_checks = sum(counts.values())
+        passed = counts['pass']
+
         # Update summary
         self.assessment_results['summary'] = {
             'total_checks': total_checks,
             'passed': passed,
-            'failed': failed,
-            'warning': warning,
-            'not_applicable': not_applicable,
+            'failed': counts['fail'],
+            'warning': counts['warning'],
+            'not_applicable': counts['not_applicable'],
             'compliance_percentage': round(passed / total_checks * 100, 2) if total_checks > 0 else 0
         }
         
-        logger.info(f"Assessment summary: {passed}/{total_checks} checks passed "
-                   f"({self.assessment_results['summary']['compliance_percentage']}% compliance)")
+        logger.info("Assessment summary: %d/%d checks passed (%s%% compliance)",
+                    passed, total_checks,
+                    self.assessment_results['summary']['compliance_percentage'])
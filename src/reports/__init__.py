@@ -2,347 +2,107 @@
 Report generation modules for CSV and PDF output.
 """
 
+import heapq
+import html
+import io
+import itertools
+import operator
 import os
 import csv
 import json
 import logging
+import pathlib
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
+from functools import cached_property
+from string import Template
 from typing import Dict, Any, Optional, Tuple
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
-class ReportGenerator:
+# Reports root, resolved once as a Path instead of three nested dirname
+# calls plus joins per ReportGenerator construction
+_REPORTS_DIR = pathlib.Path(__file__).resolve().parents[2] / 'reports'
+
+# Sort rank per severity; unknown severities sort last
+_SEVERITY_RANK = {'high': 0, 'medium': 1, 'low': 2}
+
+# Default-filled technical CSV row, merged under each result so the
+# DictWriter fills absent columns in one dict merge instead of a .get()
+# chain per field; domain policy results carry no setting path, so their
+# variant defaults that column to empty
+_CSV_ROW_DEFAULTS = {
+    'setting_name': 'Unknown',
+    'setting_path': 'Unknown',
+    'baseline_value': 'Unknown',
+    'actual_value': 'Unknown',
+    'status': 'Unknown',
+    'severity': 'Unknown',
+}
+_CSV_POLICY_ROW_DEFAULTS = {**_CSV_ROW_DEFAULTS, 'setting_path': ''}
+
+@dataclass(frozen=True, slots=True)
+class _ReportPlan:
     """
-    Generates reports based on security assessment results.
-    Compatible with the API server interface.
+    Immutable snapshot of the report configuration flags.
+
+    Resolved once per generator so the report methods read plain
+    attributes instead of repeating dict.get calls, and the flags cannot
+    drift while a report is being produced.
     """
-    
-    def __init__(self, assessment_results):
-        """
-        Initialize the report generator with assessment results.
-        
-        Args:
-            assessment_results: Dictionary containing assessment results
-        """
-        self.assessment_results = assessment_results
-        
-        # Create a temporary output directory for reports
-        self.output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 
-                                      'reports', 
-                                      f'report_{datetime.now().strftime("%Y%m%d_%H%M%S")}')
-        os.makedirs(self.output_dir, exist_ok=True)
-        
-        # Generate timestamp for filenames
-        self.timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        self.domain = assessment_results.get('domain', 'unknown_domain')
-        
-        # Store report configuration
-        self.report_config = assessment_results.get('report_config', {
-            'include_remediation': True,
-            'include_executive_summary': True,
-            'include_charts': True,
-            'company_name': 'Your Organization'
-        })
-        
-        logger.debug(f"Initialized report generator for domain: {self.domain}")
-    
-    def generate_csv(self, report_type='technical'):
-        """
-        Generate a CSV report of the assessment results.
-        
-        Args:
-            report_type: Type of report to generate ('technical' or 'executive')
-            
-        Returns:
-            Path to the generated CSV file
-        """
-        logger.info(f"Generating {report_type} CSV report")
-        
-        # Define CSV filename
-        filename = f"ad_assessment_{report_type}_{self.domain}_{self.timestamp}.csv"
-        filepath = os.path.join(self.output_dir, filename)
-        
-        try:
-            with open(filepath, 'w', newline='') as csvfile:
-                # Create CSV writer
-                csv_writer = csv.writer(csvfile)
-                
-                if report_type == 'executive':
-                    return self._generate_executive_csv(csv_writer, filepath)
-                else:
-                    return self._generate_technical_csv(csv_writer, filepath)
-                
-        except Exception as e:
-            logger.error(f"Error generating CSV report: {str(e)}", exc_info=True)
-            return ""
-    
-    def _generate_technical_csv(self, csv_writer, filepath):
-        """Generate technical CSV report"""
-        # Write header
-        if self.report_config.get('include_remediation', True):
-            csv_writer.writerow([
-                'Target', 'Setting Name', 'Setting Path', 'Baseline Value',
-                'Actual Value', 'Status', 'Severity', 'Remediation'
-            ])
-        else:
-            csv_writer.writerow([
-                'Target', 'Setting Name', 'Setting Path', 'Baseline Value',
-                'Actual Value', 'Status', 'Severity'
-            ])
-        
-        # Write domain controller results
-        for dc in self.assessment_results.get('domain_controllers', []):
-            dc_name = dc.get('name', 'Unknown')
-            for result in dc.get('results', []):
-                if self.report_config.get('include_remediation', True):
-                    csv_writer.writerow([
-                        f"DC: {dc_name}",
-                        result.get('setting_name', 'Unknown'),
-                        result.get('setting_path', 'Unknown'),
-                        result.get('baseline_value', 'Unknown'),
-                        result.get('actual_value', 'Unknown'),
-                        result.get('status', 'Unknown'),
-                        result.get('severity', 'Unknown'),
-                        self._get_remediation_step(result) if result.get('status') == 'fail' else 'N/A'
-                    ])
-                else:
-                    csv_writer.writerow([
-                        f"DC: {dc_name}",
-                        result.get('setting_name', 'Unknown'),
-                        result.get('setting_path', 'Unknown'),
-                        result.get('baseline_value', 'Unknown'),
-                        result.get('actual_value', 'Unknown'),
-                        result.get('status', 'Unknown'),
-                        result.get('severity', 'Unknown')
-                    ])
-        
-        # Write member computer results
-        for computer in self.assessment_results.get('computers', []):
-            computer_name = computer.get('name', 'Unknown')
-            for result in computer.get('results', []):
-                if self.report_config.get('include_remediation', True):
-                    csv_writer.writerow([
-                        f"Computer: {computer_name}",
-                        result.get('setting_name', 'Unknown'),
-                        result.get('setting_path', 'Unknown'),
-                        result.get('baseline_value', 'Unknown'),
-                        result.get('actual_value', 'Unknown'),
-                        result.get('status', 'Unknown'),
-                        result.get('severity', 'Unknown'),
-                        self._get_remediation_step(result) if result.get('status') == 'fail' else 'N/A'
-                    ])
-                else:
-                    csv_writer.writerow([
-                        f"Computer: {computer_name}",
-                        result.get('setting_name', 'Unknown'),
-                        result.get('setting_path', 'Unknown'),
-                        result.get('baseline_value', 'Unknown'),
-                        result.get('actual_value', 'Unknown'),
-                        result.get('status', 'Unknown'),
-                        result.get('severity', 'Unknown')
-                    ])
-        
-        # Write domain policy results
-        if 'password_policy' in self.assessment_results.get('domain_policies', {}):
-            for result in self.assessment_results['domain_policies']['password_policy'].get('results', []):
-                if self.report_config.get('include_remediation', True):
-                    csv_writer.writerow([
-                        "Domain Password Policy",
-                        result.get('setting_name', 'Unknown'),
-                        '',  # No path for domain policies
-                        result.get('baseline_value', 'Unknown'),
-                        result.get('actual_value', 'Unknown'),
-                        result.get('status', 'Unknown'),
-                        result.get('severity', 'Unknown'),
-                        self._get_remediation_step(result) if result.get('status') == 'fail' else 'N/A'
-                    ])
-                else:
-                    csv_writer.writerow([
-                        "Domain Password Policy",
-                        result.get('setting_name', 'Unknown'),
-                        '',  # No path for domain policies
-                        result.get('baseline_value', 'Unknown'),
-                        result.get('actual_value', 'Unknown'),
-                        result.get('status', 'Unknown'),
-                        result.get('severity', 'Unknown')
-                    ])
-        
-        logger.info(f"Technical CSV report generated: {filepath}")
-        return filepath
-    
-    def _generate_executive_csv(self, csv_writer, filepath):
-        """Generate executive CSV report"""
-        # Write header
-        csv_writer.writerow([
-            'Category', 'Metric', 'Value'
-        ])
-        
-        # Write summary information
-        summary = self.assessment_results.get('summary', {})
-        csv_writer.writerow(['Summary', 'Total Checks', summary.get('total_checks', 0)])
-        csv_writer.writerow(['Summary', 'Passed Checks', summary.get('passed', 0)])
-        csv_writer.writerow(['Summary', 'Failed Checks', summary.get('failed', 0)])
-        csv_writer.writerow(['Summary', 'Warning Checks', summary.get('warning', 0)])
-        csv_writer.writerow(['Summary', 'Not Applicable Checks', summary.get('not_applicable', 0)])
-        csv_writer.writerow(['Summary', 'Compliance Percentage', f"{summary.get('compliance_percentage', 0)}%"])
-        
-        # Count severity issues
-        high_severity = 0
-        medium_severity = 0
-        low_severity = 0
-        
-        # Function to count severity issues
-        def count_severity(results):
-            nonlocal high_severity, medium_severity, low_severity
-            for result in results:
-                if result.get('status') == 'fail':
-                    severity = result.get('severity', '').lower()
-                    if severity == 'high':
-                        high_severity += 1
-                    elif severity == 'medium':
-                        medium_severity += 1
-                    elif severity == 'low':
-                        low_severity += 1
-        
-        # Count issues from domain controllers
-        for dc in self.assessment_results.get('domain_controllers', []):
-            count_severity(dc.get('results', []))
-        
-        # Count issues from computers
-        for computer in self.assessment_results.get('computers', []):
-            count_severity(computer.get('results', []))
-        
-        # Count issues from domain policies
-        if 'password_policy' in self.assessment_results.get('domain_policies', {}):
-            count_severity(self.assessment_results['domain_policies']['password_policy'].get('results', []))
-        
-        # Write severity breakdown
-        csv_writer.writerow(['Severity', 'High Severity Issues', high_severity])
-        csv_writer.writerow(['Severity', 'Medium Severity Issues', medium_severity])
-        csv_writer.writerow(['Severity', 'Low Severity Issues', low_severity])
-        
-        # Write key recommendations if available
-        if self.assessment_results.get('recommendations'):
-            csv_writer.writerow(['', '', ''])  # Empty row as separator
-            csv_writer.writerow(['Key Recommendations', 'Severity', 'Target'])
-            
-            # Sort recommendations by severity
-            sorted_recommendations = sorted(
-                self.assessment_results.get('recommendations', []),
-                key=lambda x: {'high': 0, 'medium': 1, 'low': 2}.get(x.get('severity', 'low'), 3)
-            )
-            
-            # Write top 5 recommendations
-            for i, rec in enumerate(sorted_recommendations[:5]):
-                csv_writer.writerow([
-                    rec.get('recommendation', 'Unknown'),
-                    rec.get('severity', 'Unknown').upper(),
-                    rec.get('target', 'Unknown')
-                ])
-        
-        logger.info(f"Executive CSV report generated: {filepath}")
-        return filepath
-    
-    def generate_pdf(self, report_type='technical'):
-        """
-        Generate a PDF report.
-        
-        Args:
-            report_type: Type of report to generate ('technical' or 'executive')
-            
-        Returns:
-            Path to the generated PDF file
-        """
-        logger.info(f"Generating {report_type} PDF report")
-        
-        # Define PDF filename
-        filename = f"ad_assessment_{report_type}_{self.domain}_{self.timestamp}.pdf"
-        filepath = os.path.join(self.output_dir, filename)
-        
-        try:
-            # In a real implementation, this would use a PDF generation library
-            # For now, we'll create a simple HTML file as a placeholder
-            html_path = os.path.join(self.output_dir, f"ad_assessment_{report_type}_{self.domain}_{self.timestamp}.html")
-            
-            if report_type == 'executive':
-                self._generate_executive_html(html_path)
-            else:
-                self._generate_technical_html(html_path)
-            
-            logger.info(f"{report_type.capitalize()} PDF report placeholder generated: {html_path}")
-            return html_path
-            
-        except Exception as e:
-            logger.error(f"Error generating PDF report: {str(e)}", exc_info=True)
-            return ""
-    
-    def _generate_technical_html(self, html_path):
-        """Generate technical HTML report"""
-        # Count failed checks
-        failed_checks = []
-        
-        # Function to collect failed checks
-        def collect_failed_checks(results, target):
-            for result in results:
-                if result.get('status') == 'fail':
-                    failed_checks.append({
-                        'target': target,
-                        'setting_name': result.get('setting_name', 'Unknown'),
-                        'setting_path': result.get('setting_path', ''),
-                        'baseline_value': result.get('baseline_value', 'Unknown'),
-                        'actual_value': result.get('actual_value', 'Unknown'),
-                        'severity': result.get('severity', 'Unknown'),
-                        'remediation': self._get_remediation_step(result)
-                    })
-        
-        # Collect failed checks from domain controllers
-        for dc in self.assessment_results.get('domain_controllers', []):
-            dc_name = dc.get('name', 'Unknown')
-            collect_failed_checks(dc.get('results', []), f"DC: {dc_name}")
-        
-        # Collect failed checks from computers
-        for computer in self.assessment_results.get('computers', []):
-            computer_name = computer.get('name', 'Unknown')
-            collect_failed_checks(computer.get('results', []), f"Computer: {computer_name}")
-        
-        # Collect failed checks from domain policies
-        if 'password_policy' in self.assessment_results.get('domain_policies', {}):
-            collect_failed_checks(
-                self.assessment_results['domain_policies']['password_policy'].get('results', []),
-                "Domain Password Policy"
-            )
-        
-        # Sort failed checks by severity
-        failed_checks.sort(
-            key=lambda x: {'high': 0, 'medium': 1, 'low': 2}.get(x.get('severity', 'low'), 3)
-        )
-        
-        # Generate HTML content
-        summary = self.assessment_results.get('summary', {})
-        
-        with open(html_path, 'w') as f:
-            f.write(f"""<!DOCTYPE html>
+    include_remediation: bool = True
+    include_executive_summary: bool = True
+    include_charts: bool = True
+    company_name: str = 'Your Organization'
+
+# Case-normalized forms for the closed severity vocabulary, so the report
+# loops do a dict hit instead of allocating a new string per row
+_SEV_CASES = ('high', 'High', 'HIGH', 'medium', 'Medium', 'MEDIUM',
+              'low', 'Low', 'LOW', 'Unknown', 'unknown', '')
+_SEV_LOWER = {s: s.lower() for s in _SEV_CASES}
+_SEV_UPPER = {s: s.upper() for s in _SEV_CASES}
+
+def _sev_lower(severity):
+    """Lowercase a severity string, via the table for the known forms."""
+    cached = _SEV_LOWER.get(severity)
+    return cached if cached is not None else str(severity).lower()
+
+def _sev_upper(severity):
+    """Uppercase a severity string, via the table for the known forms."""
+    cached = _SEV_UPPER.get(severity)
+    return cached if cached is not None else str(severity).upper()
+
+# HTML templates compiled once at import; the writers substitute into
+# them and join the parts instead of re-parsing large f-strings per call
+_TECH_HEADER_TMPL = Template("""<!DOCTYPE html>
 <html>
 <head>
     <title>Active Directory Security Assessment Technical Report</title>
     <style>
-        body {{ font-family: Arial, sans-serif; margin: 40px; }}
-        h1, h2, h3 {{ color: #2c3e50; }}
-        table {{ border-collapse: collapse; width: 100%; margin-bottom: 20px; }}
-        th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-        th {{ background-color: #f2f2f2; }}
-        .high {{ color: #e74c3c; }}
-        .medium {{ color: #f39c12; }}
-        .low {{ color: #27ae60; }}
-        .summary-box {{ background-color: #f8f9fa; border: 1px solid #dee2e6; padding: 15px; margin-bottom: 20px; }}
-        .failed-check {{ border-bottom: 1px solid #eee; padding: 10px 0; }}
+        body { font-family: Arial, sans-serif; margin: 40px; }
+        h1, h2, h3 { color: #2c3e50; }
+        table { border-collapse: collapse; width: 100%; margin-bottom: 20px; }
+        th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
+        th { background-color: #f2f2f2; }
+        .high { color: #e74c3c; }
+        .medium { color: #f39c12; }
+        .low { color: #27ae60; }
+        .summary-box { background-color: #f8f9fa; border: 1px solid #dee2e6; padding: 15px; margin-bottom: 20px; }
+        .failed-check { border-bottom: 1px solid #eee; padding: 10px 0; }
     </style>
 </head>
 <body>
     <h1>Active Directory Security Assessment Technical Report</h1>
-    <p><strong>Domain:</strong> {self.domain}</p>
-    <p><strong>Date:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-    
+    <p><strong>Domain:</strong> $domain</p>
+    <p><strong>Date:</strong> $date</p>
+
     <div class="summary-box">
         <h2>Assessment Summary</h2>
         <table>
@@ -352,170 +112,99 @@ class ReportGenerator:
             </tr>
             <tr>
                 <td>Total Checks</td>
-                <td>{summary.get('total_checks', 0)}</td>
+                <td>$total_checks</td>
             </tr>
             <tr>
                 <td>Passed Checks</td>
-                <td>{summary.get('passed', 0)}</td>
+                <td>$passed</td>
             </tr>
             <tr>
                 <td>Failed Checks</td>
-                <td>{summary.get('failed', 0)}</td>
+                <td>$failed</td>
             </tr>
             <tr>
                 <td>Warning Checks</td>
-                <td>{summary.get('warning', 0)}</td>
+                <td>$warning</td>
             </tr>
             <tr>
                 <td>Not Applicable Checks</td>
-                <td>{summary.get('not_applicable', 0)}</td>
+                <td>$not_applicable</td>
             </tr>
             <tr>
                 <td>Compliance Percentage</td>
-                <td>{summary.get('compliance_percentage', 0)}%</td>
+                <td>$compliance_percentage%</td>
             </tr>
         </table>
     </div>
-    
+
     <h2>Failed Checks with Remediation Steps</h2>
 """)
-            
-            if failed_checks:
-                for check in failed_checks:
-                    severity_class = check.get('severity', 'low').lower()
-                    f.write(f"""
+
+_FAILED_CHECK_TMPL = Template("""
     <div class="failed-check">
-        <h3 class="{severity_class}">{check['setting_name']} ({check['severity'].upper()})</h3>
-        <p><strong>Target:</strong> {check['target']}</p>
-        {f'<p><strong>Path:</strong> {check["setting_path"]}</p>' if check['setting_path'] else ''}
-        <p><strong>Baseline Value:</strong> {check['baseline_value']}</p>
-        <p><strong>Actual Value:</strong> {check['actual_value']}</p>
-        <p><strong>Remediation:</strong> {check['remediation']}</p>
+        <h3 class="$severity_class">$setting_name ($severity_upper)</h3>
+        <p><strong>Target:</strong> $target</p>
+        $path_line<p><strong>Baseline Value:</strong> $baseline_value</p>
+        <p><strong>Actual Value:</strong> $actual_value</p>
+        <p><strong>Remediation:</strong> $remediation</p>
     </div>
 """)
-            else:
-                f.write("<p>No failed checks found.</p>")
-            
-            f.write("""
+
+_HTML_FOOTER = """
 </body>
-</html>""")
-    
-    def _generate_executive_html(self, html_path):
-        """Generate executive HTML report"""
-        # Count severity issues
-        high_severity = 0
-        medium_severity = 0
-        low_severity = 0
-        
-        # Function to count severity issues
-        def count_severity(results):
-            nonlocal high_severity, medium_severity, low_severity
-            for result in results:
-                if result.get('status') == 'fail':
-                    severity = result.get('severity', '').lower()
-                    if severity == 'high':
-                        high_severity += 1
-                    elif severity == 'medium':
-                        medium_severity += 1
-                    elif severity == 'low':
-                        low_severity += 1
-        
-        # Count issues from domain controllers
-        for dc in self.assessment_results.get('domain_controllers', []):
-            count_severity(dc.get('results', []))
-        
-        # Count issues from computers
-        for computer in self.assessment_results.get('computers', []):
-            count_severity(computer.get('results', []))
-        
-        # Count issues from domain policies
-        if 'password_policy' in self.assessment_results.get('domain_policies', {}):
-            count_severity(self.assessment_results['domain_policies']['password_policy'].get('results', []))
-        
-        # Generate key findings
-        key_findings = []
-        
-        summary = self.assessment_results.get('summary', {})
-        compliance = summary.get('compliance_percentage', 0)
-        
-        if high_severity > 0:
-            key_findings.append(f"{high_severity} high severity issues require immediate attention")
-        
-        if compliance < 70:
-            key_findings.append(f"Overall compliance is below recommended threshold (70%)")
-        
-        if 'password_policy' in self.assessment_results.get('domain_policies', {}):
-            password_policy = self.assessment_results['domain_policies']['password_policy']
-            failed_password_policies = [r for r in password_policy.get('results', []) if r.get('status') == 'fail']
-            
-            if failed_password_policies:
-                key_findings.append("Domain password policy does not meet security requirements")
-        
-        # Get top recommendations
-        top_recommendations = []
-        if self.assessment_results.get('recommendations'):
-            # Sort recommendations by severity
-            sorted_recommendations = sorted(
-                self.assessment_results.get('recommendations', []),
-                key=lambda x: {'high': 0, 'medium': 1, 'low': 2}.get(x.get('severity', 'low'), 3)
-            )
-            
-            # Get top 5 recommendations
-            top_recommendations = sorted_recommendations[:5]
-        
-        # Generate HTML content
-        with open(html_path, 'w') as f:
-            f.write(f"""<!DOCTYPE html>
+</html>"""
+
+_EXEC_HEADER_TMPL = Template("""<!DOCTYPE html>
 <html>
 <head>
     <title>Active Directory Security Assessment Executive Summary</title>
     <style>
-        body {{ font-family: Arial, sans-serif; margin: 40px; }}
-        h1, h2, h3 {{ color: #2c3e50; }}
-        table {{ border-collapse: collapse; width: 100%; margin-bottom: 20px; }}
-        th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-        th {{ background-color: #f2f2f2; }}
-        .high {{ color: #e74c3c; }}
-        .medium {{ color: #f39c12; }}
-        .low {{ color: #27ae60; }}
-        .summary-box {{ background-color: #f8f9fa; border: 1px solid #dee2e6; padding: 15px; margin-bottom: 20px; }}
-        .compliance-indicator {{ 
-            height: 20px; 
+        body { font-family: Arial, sans-serif; margin: 40px; }
+        h1, h2, h3 { color: #2c3e50; }
+        table { border-collapse: collapse; width: 100%; margin-bottom: 20px; }
+        th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
+        th { background-color: #f2f2f2; }
+        .high { color: #e74c3c; }
+        .medium { color: #f39c12; }
+        .low { color: #27ae60; }
+        .summary-box { background-color: #f8f9fa; border: 1px solid #dee2e6; padding: 15px; margin-bottom: 20px; }
+        .compliance-indicator {
+            height: 20px;
             background: linear-gradient(to right, #e74c3c, #f39c12, #27ae60);
             position: relative;
             margin: 20px 0;
-        }}
-        .compliance-marker {{
+        }
+        .compliance-marker {
             position: absolute;
             width: 2px;
             height: 30px;
             background-color: #2c3e50;
             top: -5px;
-            left: {compliance}%;
-        }}
-        .compliance-label {{
+            left: $compliance%;
+        }
+        .compliance-label {
             position: absolute;
             top: 25px;
-            left: {compliance - 10}%;
+            left: $compliance_label_pos%;
             font-weight: bold;
-        }}
+        }
     </style>
 </head>
 <body>
     <h1>Active Directory Security Assessment Executive Summary</h1>
-    <p><strong>Domain:</strong> {self.domain}</p>
-    <p><strong>Date:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-    <p><strong>Organization:</strong> {self.report_config.get('company_name', 'Your Organization')}</p>
-    
+    <p><strong>Domain:</strong> $domain</p>
+    <p><strong>Date:</strong> $date</p>
+    <p><strong>Organization:</strong> $organization</p>
+
     <div class="summary-box">
         <h2>Compliance Overview</h2>
-        <p>Overall compliance score: <strong>{compliance}%</strong></p>
-        
+        <p>Overall compliance score: <strong>$compliance%</strong></p>
+
         <div class="compliance-indicator">
             <div class="compliance-marker"></div>
-            <div class="compliance-label">{compliance}%</div>
+            <div class="compliance-label">$compliance%</div>
         </div>
-        
+
         <table>
             <tr>
                 <th>Metric</th>
@@ -523,19 +212,19 @@ class ReportGenerator:
             </tr>
             <tr>
                 <td>Total Checks</td>
-                <td>{summary.get('total_checks', 0)}</td>
+                <td>$total_checks</td>
             </tr>
             <tr>
                 <td>Passed Checks</td>
-                <td>{summary.get('passed', 0)}</td>
+                <td>$passed</td>
             </tr>
             <tr>
                 <td>Failed Checks</td>
-                <td>{summary.get('failed', 0)}</td>
+                <td>$failed</td>
             </tr>
         </table>
     </div>
-    
+
     <div class="summary-box">
         <h2>Severity Breakdown</h2>
         <table>
@@ -546,39 +235,28 @@ class ReportGenerator:
             </tr>
             <tr class="high">
                 <td>High</td>
-                <td>{high_severity}</td>
+                <td>$high_severity</td>
                 <td>Critical issues that require immediate attention</td>
             </tr>
             <tr class="medium">
                 <td>Medium</td>
-                <td>{medium_severity}</td>
+                <td>$medium_severity</td>
                 <td>Important issues that should be addressed soon</td>
             </tr>
             <tr class="low">
                 <td>Low</td>
-                <td>{low_severity}</td>
+                <td>$low_severity</td>
                 <td>Minor issues that should be reviewed</td>
             </tr>
         </table>
     </div>
-    
+
     <div class="summary-box">
         <h2>Key Findings</h2>
         <ul>
 """)
-            
-            for finding in key_findings:
-                f.write(f"            <li>{finding}</li>\n")
-            
-            if not key_findings:
-                f.write("            <li>No significant issues found</li>\n")
-            
-            f.write("""        </ul>
-    </div>
-""")
-            
-            if top_recommendations:
-                f.write("""    <div class="summary-box">
+
+_EXEC_RECOMMENDATIONS_HEADER = """    <div class="summary-box">
         <h2>Top Recommendations</h2>
         <table>
             <tr>
@@ -586,123 +264,554 @@ class ReportGenerator:
                 <th>Severity</th>
                 <th>Target</th>
             </tr>
-""")
-                
-                for rec in top_recommendations:
-                    severity_class = rec.get('severity', 'low').lower()
-                    f.write(f"""            <tr class="{severity_class}">
-                <td>{rec.get('recommendation', 'Unknown')}</td>
-                <td>{rec.get('severity', 'Unknown').upper()}</td>
-                <td>{rec.get('target', 'Unknown')}</td>
+"""
+
+_EXEC_RECOMMENDATION_ROW_TMPL = Template("""            <tr class="$severity_class">
+                <td>$recommendation</td>
+                <td>$severity_upper</td>
+                <td>$target</td>
             </tr>
 """)
+
+class ReportGenerator:
+    """
+    Generates reports based on security assessment results.
+    Compatible with the API server interface.
+    """
+    
+    def __init__(self, assessment_results):
+        """
+        Initialize the report generator with assessment results.
+        
+        Args:
+            assessment_results: Dictionary containing assessment results
+        """
+        self.assessment_results = assessment_results
+
+        # Generate both timestamp forms from one datetime.now() call,
+        # shared by the directory name, filenames and report headers
+        now = datetime.now()
+        self.timestamp = now.strftime('%Y%m%d_%H%M%S')
+        self._now_str = now.strftime('%Y-%m-%d %H:%M:%S')
+
+        self.domain = assessment_results.get('domain', 'unknown_domain')
+        
+        # Store report configuration
+        self.report_config = assessment_results.get('report_config', {
+            'include_remediation': True,
+            'include_executive_summary': True,
+            'include_charts': True,
+            'company_name': 'Your Organization'
+        })
+        
+        # Snapshot the config flags once; downstream code reads the plan's
+        # attributes instead of re-querying the config dict per call
+        self._plan = _ReportPlan(
+            include_remediation=bool(self.report_config.get('include_remediation', True)),
+            include_executive_summary=bool(self.report_config.get('include_executive_summary', True)),
+            include_charts=bool(self.report_config.get('include_charts', True)),
+            company_name=self.report_config.get('company_name', 'Your Organization'),
+        )
+
+        # Derived views filled in by _aggregate() on first report; every
+        # report flavor reads these instead of re-walking the result lists
+        self._aggregated = False
+        self._failed_checks = []
+        self._severity_counts = Counter()
+        self._top_recommendations = []
+        self._password_policy_failed = False
+        # Recommendations bucketed by setting name, built on first
+        # remediation lookup
+        self._rec_buckets = None
+        # Failed checks pre-escaped for the HTML template, built on first
+        # HTML render; CSV and JSON consumers keep the raw values
+        self._failed_checks_html = None
+
+        logger.debug(f"Initialized report generator for domain: {self.domain}")
+
+    def _iter_all_results(self):
+        """
+        Yield (target, result) pairs across every assessed scope.
+
+        Walks domain controllers, member computers and the domain password
+        policy in one place, building each target label once per group, so
+        the report methods don't each reimplement the traversal.
+        """
+        results = self.assessment_results
+
+        for dc in results.get('domain_controllers', []):
+            target = f"DC: {dc.get('name', 'Unknown')}"
+            for result in dc.get('results', []):
+                yield target, result
+
+        for computer in results.get('computers', []):
+            target = f"Computer: {computer.get('name', 'Unknown')}"
+            for result in computer.get('results', []):
+                yield target, result
+
+        # Some callers hand in domain_policies as a list; only a dict can
+        # carry a password policy
+        domain_policies = results.get('domain_policies', {})
+        if isinstance(domain_policies, dict):
+            password_policy = domain_policies.get('password_policy')
+            if password_policy:
+                for result in password_policy.get('results', []):
+                    yield "Domain Password Policy", result
+
+    def _aggregate(self):
+        """
+        Walk the assessment results once and cache the derived views.
+
+        Every report flavor needs the same failed-check list, severity
+        counts and severity-sorted recommendations, so they are computed
+        in a single pass here; generating CSV, HTML and JSON previews
+        from the same generator never traverses the result lists again.
+        """
+        if self._aggregated:
+            return
+
+        # Bucket failed checks by severity during the pass; chaining the
+        # buckets afterwards gives the severity ordering in O(N) without a
+        # sort, and the breakdown counts fall out of the bucket lengths
+        buckets = {'high': [], 'medium': [], 'low': []}
+        other = []
+
+        for target, result in self._iter_all_results():
+            get = result.get
+            if get('status') != 'fail':
+                continue
+            if target == "Domain Password Policy":
+                self._password_policy_failed = True
+            severity = get('severity', 'Unknown')
+            buckets.get(_sev_lower(severity), other).append({
+                'target': target,
+                'setting_name': get('setting_name', 'Unknown'),
+                'setting_path': get('setting_path', ''),
+                'baseline_value': get('baseline_value', 'Unknown'),
+                'actual_value': get('actual_value', 'Unknown'),
+                'severity': severity,
+                'remediation': self._get_remediation_step(result)
+            })
+
+        self._failed_checks = list(itertools.chain(
+            buckets['high'], buckets['medium'], buckets['low'], other
+        ))
+        # Missing severities read back as 0 from the Counter
+        self._severity_counts = Counter(
+            {severity: len(checks) for severity, checks in buckets.items()}
+        )
+
+        # Every consumer renders at most the top five recommendations, so
+        # select them with a bounded heap in O(N log 5) instead of sorting
+        # the whole list; nsmallest is stable for equal ranks like sort
+        rank = _SEVERITY_RANK.get
+        self._top_recommendations = heapq.nsmallest(
+            5, self.assessment_results.get('recommendations', []),
+            key=lambda rec: rank(rec.get('severity', 'low'), 3))
+
+        self._aggregated = True
+
+    def _escaped_failed_checks(self):
+        """
+        Failed checks as substitution dicts for the HTML check template.
+
+        Escaping and case normalization happen once per check here, so
+        repeated HTML renders (preview plus PDF placeholder, technical
+        plus executive) are pure template substitution.
+        """
+        if self._failed_checks_html is None:
+            self._aggregate()
+            escape = html.escape
+            self._failed_checks_html = [
+                {
+                    'severity_class': _sev_lower(check['severity']),
+                    'severity_upper': _sev_upper(check['severity']),
+                    'setting_name': escape(str(check['setting_name'])),
+                    'target': escape(str(check['target'])),
+                    'path_line': (f"<p><strong>Path:</strong> {escape(str(check['setting_path']))}</p>\n        "
+                                  if check['setting_path'] else ''),
+                    'baseline_value': escape(str(check['baseline_value'])),
+                    'actual_value': escape(str(check['actual_value'])),
+                    'remediation': escape(str(check['remediation']))
+                }
+                for check in self._failed_checks
+            ]
+        return self._failed_checks_html
+
+    def _key_findings(self, high_severity, compliance):
+        """Build the executive key findings list from the aggregates."""
+        key_findings = []
+
+        if high_severity > 0:
+            key_findings.append(f"{high_severity} high severity issues require immediate attention")
+
+        if compliance < 70:
+            key_findings.append("Overall compliance is below recommended threshold (70%)")
+
+        # The flag is fused into the aggregation pass, so no extra scan of
+        # the password policy results happens here
+        self._aggregate()
+        if self._password_policy_failed:
+            key_findings.append("Domain password policy does not meet security requirements")
+
+        return key_findings
+
+    @cached_property
+    def output_dir(self):
+        """
+        Report output directory, created on first access.
+
+        Previews never touch this property, so generators built only to
+        serve a preview cost no filesystem syscalls at all.
+        """
+        path = _REPORTS_DIR / f'report_{self.timestamp}'
+        path.mkdir(parents=True, exist_ok=True)
+        return str(path)
+
+    def generate_csv(self, report_type='technical'):
+        """
+        Generate a CSV report of the assessment results.
+        
+        Args:
+            report_type: Type of report to generate ('technical' or 'executive')
+            
+        Returns:
+            Path to the generated CSV file
+        """
+        logger.info(f"Generating {report_type} CSV report")
+        
+        # Define CSV filename
+        filename = f"ad_assessment_{report_type}_{self.domain}_{self.timestamp}.csv"
+
+        try:
+            # Resolving output_dir creates the directory on first access
+            filepath = os.path.join(self.output_dir, filename)
+            # Large write buffer so the batched rows flush in a handful of
+            # syscalls instead of one per buffer-crossing row
+            with open(filepath, 'w', newline='', buffering=1 << 20) as csvfile:
+                if report_type == 'executive':
+                    return self._generate_executive_csv(csvfile, filepath)
+                else:
+                    return self._generate_technical_csv(csvfile, filepath)
                 
-                f.write("""        </table>
+        except Exception as e:
+            logger.error(f"Error generating CSV report: {str(e)}", exc_info=True)
+            return ""
+    
+    def _generate_technical_csv(self, csvfile, filepath):
+        """Generate technical CSV report"""
+        # Bind the row builder matching the plan's remediation flag,
+        # instead of re-reading the config and branching per row
+        include_remediation = self._plan.include_remediation
+        get_remediation = self._get_remediation_step
+
+        header = ['Target', 'Setting Name', 'Setting Path', 'Baseline Value',
+                  'Actual Value', 'Status', 'Severity']
+        fieldnames = ['target', 'setting_name', 'setting_path', 'baseline_value',
+                      'actual_value', 'status', 'severity']
+        if include_remediation:
+            header.append('Remediation')
+            fieldnames.append('remediation')
+
+            def make_row(target, result, defaults):
+                row = {**defaults, **result, 'target': target}
+                row['remediation'] = (get_remediation(result)
+                                      if result.get('status') == 'fail' else 'N/A')
+                return row
+        else:
+            def make_row(target, result, defaults):
+                return {**defaults, **result, 'target': target}
+
+        csv.writer(csvfile, dialect='unix', quoting=csv.QUOTE_MINIMAL).writerow(header)
+
+        # One C-level dict merge over the defaults replaces the .get()
+        # chain per field; the DictWriter drops any extra result keys and
+        # target labels are built once per group inside the iterator
+        # unix dialect writes bare \n terminators, halving the line-ending
+        # bytes; QUOTE_MINIMAL overrides its quote-everything default
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction='ignore',
+                                dialect='unix', quoting=csv.QUOTE_MINIMAL)
+        writer.writerows(
+            make_row(target, result,
+                     _CSV_POLICY_ROW_DEFAULTS if target == "Domain Password Policy"
+                     else _CSV_ROW_DEFAULTS)
+            for target, result in self._iter_all_results()
+        )
+
+        logger.info(f"Technical CSV report generated: {filepath}")
+        return filepath
+    
+    def _generate_executive_csv(self, csvfile, filepath):
+        """Generate executive CSV report"""
+        csv_writer = csv.writer(csvfile, dialect='unix', quoting=csv.QUOTE_MINIMAL)
+
+        # Severity counts and sorted recommendations come from the shared
+        # aggregation pass
+        self._aggregate()
+        summary = self.assessment_results.get('summary', {})
+        severity_counts = self._severity_counts
+
+        # Build the whole sheet as one list and hand it to writerows, so
+        # the formatting loop runs in C instead of one writerow call per row
+        rows = [
+            ['Category', 'Metric', 'Value'],
+            ['Summary', 'Total Checks', summary.get('total_checks', 0)],
+            ['Summary', 'Passed Checks', summary.get('passed', 0)],
+            ['Summary', 'Failed Checks', summary.get('failed', 0)],
+            ['Summary', 'Warning Checks', summary.get('warning', 0)],
+            ['Summary', 'Not Applicable Checks', summary.get('not_applicable', 0)],
+            ['Summary', 'Compliance Percentage', f"{summary.get('compliance_percentage', 0)}%"],
+            ['Severity', 'High Severity Issues', severity_counts['high']],
+            ['Severity', 'Medium Severity Issues', severity_counts['medium']],
+            ['Severity', 'Low Severity Issues', severity_counts['low']],
+        ]
+
+        # Append key recommendations if available
+        if self._top_recommendations:
+            rows.append(['', '', ''])  # Empty row as separator
+            rows.append(['Key Recommendations', 'Severity', 'Target'])
+            rows.extend(
+                [rec.get('recommendation', 'Unknown'),
+                 _sev_upper(rec.get('severity', 'Unknown')),
+                 rec.get('target', 'Unknown')]
+                for rec in self._top_recommendations
+            )
+
+        csv_writer.writerows(rows)
+
+        logger.info(f"Executive CSV report generated: {filepath}")
+        return filepath
+    
+    def generate_pdf(self, report_type='technical'):
+        """
+        Generate a PDF report.
+        
+        Args:
+            report_type: Type of report to generate ('technical' or 'executive')
+            
+        Returns:
+            Path to the generated PDF file
+        """
+        logger.info(f"Generating {report_type} PDF report")
+        
+        try:
+            # In a real implementation, this would use a PDF generation library
+            # For now, we'll create a simple HTML file as a placeholder;
+            # resolving output_dir creates the directory on first access
+            html_path = os.path.join(self.output_dir, f"ad_assessment_{report_type}_{self.domain}_{self.timestamp}.html")
+
+            # Large write buffer so the joined document flushes in a few
+            # big syscalls even when it outgrows the default 8 KiB buffer
+            with open(html_path, 'w', buffering=1 << 20, encoding='utf-8') as f:
+                if report_type == 'executive':
+                    self._generate_executive_html(f)
+                else:
+                    self._generate_technical_html(f)
+
+            logger.info(f"{report_type.capitalize()} PDF report placeholder generated: {html_path}")
+            return html_path
+            
+        except Exception as e:
+            logger.error(f"Error generating PDF report: {str(e)}", exc_info=True)
+            return ""
+
+    def generate_all(self, report_type='technical'):
+        """
+        Generate the PDF and CSV reports concurrently.
+
+        The two generators share no mutable state after construction and
+        are I/O-bound, so a two-worker thread pool overlaps them; callers
+        that want both formats wait roughly for the slower one instead of
+        the sum.
+
+        Args:
+            report_type: Type of report to generate ('technical' or 'executive')
+
+        Returns:
+            Tuple of (pdf_path, csv_path)
+        """
+        # Warm the shared aggregates before the workers start; otherwise
+        # both threads could race to build the same cache and do the
+        # traversal twice
+        self._aggregate()
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            pdf_future = executor.submit(self.generate_pdf, report_type)
+            csv_future = executor.submit(self.generate_csv, report_type)
+            return pdf_future.result(), csv_future.result()
+
+    def _generate_technical_html(self, out):
+        """Generate the technical HTML report into a writable text stream"""
+        # Failed checks come pre-collected, severity-sorted and
+        # HTML-escaped from the shared caches
+        failed_checks = self._escaped_failed_checks()
+
+        # Generate HTML content
+        summary = self.assessment_results.get('summary', {})
+
+        # Substitute into the precompiled templates, collecting the parts
+        # and writing them in one shot instead of a write per block
+        parts = [_TECH_HEADER_TMPL.substitute(
+            domain=html.escape(str(self.domain)),
+            date=self._now_str,
+            total_checks=summary.get('total_checks', 0),
+            passed=summary.get('passed', 0),
+            failed=summary.get('failed', 0),
+            warning=summary.get('warning', 0),
+            not_applicable=summary.get('not_applicable', 0),
+            compliance_percentage=summary.get('compliance_percentage', 0)
+        )]
+
+        if failed_checks:
+            substitute = _FAILED_CHECK_TMPL.substitute
+            parts.extend(substitute(check) for check in failed_checks)
+        else:
+            parts.append("<p>No failed checks found.</p>")
+
+        parts.append(_HTML_FOOTER)
+
+        out.write("".join(parts))
+    
+    def _generate_executive_html(self, out):
+        """Generate the executive HTML report into a writable text stream"""
+        # Severity counts, key findings and top recommendations come from
+        # the shared aggregation pass
+        self._aggregate()
+        high_severity = self._severity_counts['high']
+        medium_severity = self._severity_counts['medium']
+        low_severity = self._severity_counts['low']
+
+        summary = self.assessment_results.get('summary', {})
+        compliance = summary.get('compliance_percentage', 0)
+
+        key_findings = self._key_findings(high_severity, compliance)
+        top_recommendations = self._top_recommendations
+
+        # Substitute into the precompiled templates, collecting the parts
+        # and writing them in one shot instead of a write per block
+        escape = html.escape
+        parts = [_EXEC_HEADER_TMPL.substitute(
+            compliance=compliance,
+            compliance_label_pos=compliance - 10,
+            domain=escape(str(self.domain)),
+            date=self._now_str,
+            organization=escape(str(self._plan.company_name)),
+            total_checks=summary.get('total_checks', 0),
+            passed=summary.get('passed', 0),
+            failed=summary.get('failed', 0),
+            high_severity=high_severity,
+            medium_severity=medium_severity,
+            low_severity=low_severity
+        )]
+
+        if key_findings:
+            parts.extend(f"            <li>{escape(finding)}</li>\n" for finding in key_findings)
+        else:
+            parts.append("            <li>No significant issues found</li>\n")
+
+        parts.append("""        </ul>
     </div>
 """)
-            
-            f.write("""</body>
-</html>""")
+
+        if top_recommendations:
+            parts.append(_EXEC_RECOMMENDATIONS_HEADER)
+            for rec in top_recommendations:
+                severity = rec.get('severity', 'low')
+                parts.append(_EXEC_RECOMMENDATION_ROW_TMPL.substitute(
+                    severity_class=_sev_lower(severity),
+                    severity_upper=_sev_upper(rec.get('severity', 'Unknown')),
+                    recommendation=escape(str(rec.get('recommendation', 'Unknown'))),
+                    target=escape(str(rec.get('target', 'Unknown')))
+                ))
+            parts.append("""        </table>
+    </div>
+""")
+
+        parts.append("</body>\n</html>")
+
+        out.write("".join(parts))
     
     def _get_remediation_step(self, result):
         """Get remediation step for a failed check"""
         # First check if the result has a remediation field
         if 'remediation' in result:
             return result['remediation']
-        
-        # If not, check if there's a recommendation in the assessment results
-        for rec in self.assessment_results.get('recommendations', []):
-            if (rec.get('setting') == result.get('setting_name') and
-                rec.get('target', '').endswith(result.get('target', ''))):
+
+        # Index the recommendations by setting name once; the linear scan
+        # over every recommendation per failed check was O(fails x recs)
+        if self._rec_buckets is None:
+            buckets = defaultdict(list)
+            for rec in self.assessment_results.get('recommendations', []):
+                buckets[rec.get('setting')].append(rec)
+            self._rec_buckets = buckets
+
+        # The endswith match only needs to run within the (small) bucket
+        # of recommendations for this setting
+        target = result.get('target', '')
+        for rec in self._rec_buckets.get(result.get('setting_name'), ()):
+            if rec.get('target', '').endswith(target):
                 return rec.get('recommendation', '')
-        
+
         # If no specific remediation is found, generate a generic one
         setting_name = result.get('setting_name', 'Unknown')
         baseline_value = result.get('baseline_value', 'Unknown')
         return f"Configure {setting_name} to match the baseline value: {baseline_value}. This can typically be done through Group Policy or local security policy."
     
-    def generate_report_preview(self, report_type='technical', format='html'):
+    def generate_report_preview(self, report_type='technical', format='html', raw_bytes=False):
         """
         Generate a preview of a report.
-        
+
         Args:
             report_type: Type of report to preview ('technical' or 'executive')
             format: Format of the preview ('html' or 'json')
-            
+            raw_bytes: For JSON previews, return the payload already
+                serialized to UTF-8 bytes so callers can send it on the
+                wire without a second json.dumps pass
+
         Returns:
-            Preview content as HTML or JSON
+            Preview content as HTML, a JSON-serializable dict, or bytes
+            when raw_bytes is set
         """
         logger.info(f"Generating {report_type} report preview in {format} format")
         
         if format == 'html':
-            # Create a temporary file for the preview
-            preview_path = os.path.join(self.output_dir, f"preview_{report_type}_{self.timestamp}.html")
-            
+            # Render straight into an in-memory buffer; previews never
+            # need to touch the filesystem
+            buf = io.StringIO()
             if report_type == 'executive':
-                self._generate_executive_html(preview_path)
+                self._generate_executive_html(buf)
             else:
-                self._generate_technical_html(preview_path)
-            
-            # Read the generated HTML
-            with open(preview_path, 'r') as f:
-                preview_content = f.read()
-            
-            return preview_content
+                self._generate_technical_html(buf)
+            return buf.getvalue()
         else:
             # Generate JSON preview
             if report_type == 'executive':
-                return self._generate_executive_json_preview()
+                preview = self._generate_executive_json_preview()
             else:
-                return self._generate_technical_json_preview()
+                preview = self._generate_technical_json_preview()
+
+            if raw_bytes:
+                # Serialize here with orjson when available; its C encoder
+                # is several times faster than stdlib json on dict payloads
+                if orjson is not None:
+                    return orjson.dumps(preview)
+                return json.dumps(preview).encode('utf-8')
+
+            return preview
     
     def _generate_technical_json_preview(self):
         """Generate technical report preview in JSON format"""
-        # Count failed checks
-        failed_checks = []
-        
-        # Function to collect failed checks
-        def collect_failed_checks(results, target):
-            for result in results:
-                if result.get('status') == 'fail':
-                    failed_checks.append({
-                        'target': target,
-                        'setting_name': result.get('setting_name', 'Unknown'),
-                        'setting_path': result.get('setting_path', ''),
-                        'baseline_value': result.get('baseline_value', 'Unknown'),
-                        'actual_value': result.get('actual_value', 'Unknown'),
-                        'severity': result.get('severity', 'Unknown'),
-                        'remediation': self._get_remediation_step(result)
-                    })
-        
-        # Collect failed checks from domain controllers
-        for dc in self.assessment_results.get('domain_controllers', []):
-            dc_name = dc.get('name', 'Unknown')
-            collect_failed_checks(dc.get('results', []), f"DC: {dc_name}")
-        
-        # Collect failed checks from computers
-        for computer in self.assessment_results.get('computers', []):
-            computer_name = computer.get('name', 'Unknown')
-            collect_failed_checks(computer.get('results', []), f"Computer: {computer_name}")
-        
-        # Collect failed checks from domain policies
-        if 'password_policy' in self.assessment_results.get('domain_policies', {}):
-            collect_failed_checks(
-                self.assessment_results['domain_policies']['password_policy'].get('results', []),
-                "Domain Password Policy"
-            )
-        
-        # Sort failed checks by severity
-        failed_checks.sort(
-            key=lambda x: {'high': 0, 'medium': 1, 'low': 2}.get(x.get('severity', 'low'), 3)
-        )
-        
+        # Failed checks come pre-collected and severity-sorted from the
+        # shared aggregation pass
+        self._aggregate()
+
         # Generate JSON preview
         summary = self.assessment_results.get('summary', {})
         
         return {
             'title': 'Technical Security Assessment Report',
             'domain': self.domain,
-            'date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'date': self._now_str,
             'summary': {
                 'total_checks': summary.get('total_checks', 0),
                 'passed': summary.get('passed', 0),
@@ -711,78 +820,28 @@ class ReportGenerator:
                 'not_applicable': summary.get('not_applicable', 0),
                 'compliance_percentage': summary.get('compliance_percentage', 0)
             },
-            'failed_checks': failed_checks
+            'failed_checks': self._failed_checks
         }
     
     def _generate_executive_json_preview(self):
         """Generate executive report preview in JSON format"""
-        # Count severity issues
-        high_severity = 0
-        medium_severity = 0
-        low_severity = 0
-        
-        # Function to count severity issues
-        def count_severity(results):
-            nonlocal high_severity, medium_severity, low_severity
-            for result in results:
-                if result.get('status') == 'fail':
-                    severity = result.get('severity', '').lower()
-                    if severity == 'high':
-                        high_severity += 1
-                    elif severity == 'medium':
-                        medium_severity += 1
-                    elif severity == 'low':
-                        low_severity += 1
-        
-        # Count issues from domain controllers
-        for dc in self.assessment_results.get('domain_controllers', []):
-            count_severity(dc.get('results', []))
-        
-        # Count issues from computers
-        for computer in self.assessment_results.get('computers', []):
-            count_severity(computer.get('results', []))
-        
-        # Count issues from domain policies
-        if 'password_policy' in self.assessment_results.get('domain_policies', {}):
-            count_severity(self.assessment_results['domain_policies']['password_policy'].get('results', []))
-        
-        # Generate key findings
-        key_findings = []
-        
+        # Severity counts, key findings and top recommendations come from
+        # the shared aggregation pass
+        self._aggregate()
+        severity_counts = self._severity_counts
+
         summary = self.assessment_results.get('summary', {})
         compliance = summary.get('compliance_percentage', 0)
-        
-        if high_severity > 0:
-            key_findings.append(f"{high_severity} high severity issues require immediate attention")
-        
-        if compliance < 70:
-            key_findings.append(f"Overall compliance is below recommended threshold (70%)")
-        
-        if 'password_policy' in self.assessment_results.get('domain_policies', {}):
-            password_policy = self.assessment_results['domain_policies']['password_policy']
-            failed_password_policies = [r for r in password_policy.get('results', []) if r.get('status') == 'fail']
-            
-            if failed_password_policies:
-                key_findings.append("Domain password policy does not meet security requirements")
-        
-        # Get top recommendations
-        top_recommendations = []
-        if self.assessment_results.get('recommendations'):
-            # Sort recommendations by severity
-            sorted_recommendations = sorted(
-                self.assessment_results.get('recommendations', []),
-                key=lambda x: {'high': 0, 'medium': 1, 'low': 2}.get(x.get('severity', 'low'), 3)
-            )
-            
-            # Get top 5 recommendations
-            top_recommendations = sorted_recommendations[:5]
-        
+
+        key_findings = self._key_findings(severity_counts['high'], compliance)
+        top_recommendations = self._top_recommendations
+
         # Generate JSON preview
         return {
             'title': 'Executive Security Assessment Summary',
             'domain': self.domain,
-            'date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'organization': self.report_config.get('company_name', 'Your Organization'),
+            'date': self._now_str,
+            'organization': self._plan.company_name,
             'compliance': compliance,
             'summary': {
                 'total_checks': summary.get('total_checks', 0),
@@ -790,9 +849,9 @@ class ReportGenerator:
                 'failed': summary.get('failed', 0)
             },
             'severity_breakdown': {
-                'high': high_severity,
-                'medium': medium_severity,
-                'low': low_severity
+                'high': severity_counts['high'],
+                'medium': severity_counts['medium'],
+                'low': severity_counts['low']
             },
             'key_findings': key_findings,
             'top_recommendations': [
@@ -4,70 +4,125 @@ Operating System Detector
 This module provides utilities for detecting and identifying operating systems.
 """
 
+import bisect
+import functools
 import logging
 import re
 from typing import Dict, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Windows 10/11 build thresholds and their marketing names, kept sorted
+# so a binary search replaces the chained comparisons; extend both
+# tuples together as new builds ship
+_BUILD_THRESHOLDS = (18363, 19041, 19042, 22000)
+_BUILD_NAMES = ('Windows 10 1909', 'Windows 10 2004',
+                'Windows 10 20H2 or newer', 'Windows 11')
+
 class OSDetector:
     """
     Detects and identifies operating systems based on name and version strings.
     """
     
+    # Patterns are compiled once at import as class-level constants, so
+    # creating a detector per host or call site pays no compile cost
+
+    # OS name patterns
+    os_patterns = {
+        'windows_server': re.compile(r'windows\s+server', re.IGNORECASE),
+        'windows_client': re.compile(r'windows\s+(?!server)([\w\s]+)', re.IGNORECASE),
+        'linux': re.compile(r'linux', re.IGNORECASE),
+        'macos': re.compile(r'mac\s*os|darwin', re.IGNORECASE)
+    }
+
+    # Single alternation over all OS patterns; one scan of the string
+    # classifies the OS via the named group that matched, instead of
+    # up to four separate searches each restarting from position 0.
+    # The detector lowercases its input once, so the internal patterns
+    # skip IGNORECASE and its per-character case folding
+    _combined_pattern = re.compile(
+        r'(?P<windows_server>windows\s+server)'
+        r'|(?P<windows_client>windows\s+(?!server)[\w\s]+)'
+        r'|(?P<linux>linux)'
+        r'|(?P<macos>mac\s*os|darwin)'
+    )
+
+    # Version patterns, matched against the lowercased input
+    version_patterns = {
+        'windows_server': re.compile(r'(\d{4}(?:\s*r\d)?)'),  # 2019, 2016, 2012 R2
+        # Numeric versions first, then the named releases on word
+        # boundaries; the old trailing [\w\s]+ catch-all could backtrack
+        # quadratically on long malformed strings and swallowed arbitrary
+        # text as a "version"
+        'windows_client': re.compile(r'((?:\d+\.)*\d+|\b(?:xp|vista)\b)'),  # 10, 8.1, 7, XP
+        'linux': re.compile(r'(\d+(?:\.\d+)*)'),
+        'macos': re.compile(r'(\d+(?:\.\d+)*)')
+    }
+
+    # Fallback version pattern, reused both as the version_patterns
+    # default and for the unknown-OS version probe
+    _version_fallback = re.compile(r'(\d+(?:\.\d+)*)')
+
     def __init__(self):
         """Initialize the OS detector."""
-        # Define OS name patterns
-        self.os_patterns = {
-            'windows_server': re.compile(r'windows\s+server', re.IGNORECASE),
-            'windows_client': re.compile(r'windows\s+(?!server)([\w\s]+)', re.IGNORECASE),
-            'linux': re.compile(r'linux', re.IGNORECASE),
-            'macos': re.compile(r'mac\s*os|darwin', re.IGNORECASE)
-        }
-        
-        # Define version patterns
-        self.version_patterns = {
-            'windows_server': re.compile(r'(\d{4}(?:\s*r\d)?)', re.IGNORECASE),  # 2019, 2016, 2012 R2
-            'windows_client': re.compile(r'((?:\d+\.)*\d+|xp|vista|[\w\s]+)', re.IGNORECASE),  # 10, 8.1, 7, XP
-            'linux': re.compile(r'(\d+(?:\.\d+)*)', re.IGNORECASE),
-            'macos': re.compile(r'(\d+(?:\.\d+)*)', re.IGNORECASE)
-        }
-        
+        # An AD inventory holds few distinct OS strings but each one is
+        # looked up several times (type, family, server check), so memoize
+        # the regex classification per instance
+        self._detect_cached = functools.lru_cache(maxsize=4096)(self._detect_os_type_uncached)
+
         logger.debug("Initialized OS detector")
-    
+
     def detect_os_type(self, os_string: str) -> Tuple[str, Optional[str]]:
         """
         Detect the OS type and version from a string.
-        
+
         Args:
             os_string: String containing OS information
-            
+
         Returns:
             Tuple of (os_type, os_version) where os_type is one of:
             'windows_server', 'windows_client', 'linux', 'macos', 'unknown'
         """
         if not os_string:
             return 'unknown', None
-        
-        # Check each OS pattern
-        for os_type, pattern in self.os_patterns.items():
-            if pattern.search(os_string):
-                # Extract version if available
-                version_match = self.version_patterns.get(os_type, re.compile(r'(\d+(?:\.\d+)*)')).search(os_string)
-                version = version_match.group(1) if version_match else None
-                
-                # For Windows client, extract just the numeric version
-                if os_type == 'windows_client' and version:
-                    # Extract just the numeric part (e.g., "10" from "Windows 10 Enterprise")
-                    numeric_version_match = re.search(r'(\d+)', version)
-                    if numeric_version_match:
-                        version = numeric_version_match.group(1)
-                
-                logger.debug(f"Detected OS: {os_type}, version: {version}")
-                return os_type, version
-        
-        # If no match, try to extract any version-like string
-        version_match = re.search(r'(\d+(?:\.\d+)*)', os_string)
+
+        return self._detect_cached(os_string)
+
+    def _detect_os_type_uncached(self, os_string: str) -> Tuple[str, Optional[str]]:
+        """Classify an OS string; detect_os_type caches these results."""
+        # Lowercase once and match everything against the folded copy
+        lowered = os_string.lower()
+
+        # One pass over the string; the named group that matched names the
+        # OS type, then only the matching version pattern runs
+        match = self._combined_pattern.search(lowered)
+        if match:
+            os_type = match.lastgroup
+            version_match = self.version_patterns.get(os_type, self._version_fallback).search(lowered)
+            if version_match:
+                # Slice the original string so the version keeps its
+                # casing (e.g. "2012 R2"); the fold preserves offsets
+                # for these ASCII inventory strings
+                version = (os_string[version_match.start(1):version_match.end(1)]
+                           if len(lowered) == len(os_string)
+                           else version_match.group(1))
+            else:
+                version = None
+
+            # For Windows client, extract just the numeric version
+            if os_type == 'windows_client' and version:
+                # Extract just the numeric part (e.g., "10" from "Windows 10 Enterprise")
+                numeric_version_match = re.search(r'(\d+)', version)
+                if numeric_version_match:
+                    version = numeric_version_match.group(1)
+
+            logger.debug(f"Detected OS: {os_type}, version: {version}")
+            return os_type, version
+
+
+        # If no match, try to extract any version-like string (digits
+        # only, so matching the folded copy loses nothing)
+        version_match = self._version_fallback.search(lowered)
         version = version_match.group(1) if version_match else None
         
         logger.debug(f"Unknown OS type from string: {os_string}, possible version: {version}")
@@ -98,11 +153,16 @@ class OSDetector:
                 'full_name': 'Unknown'
             }
         
-        # Detect OS type and version
-        os_type, detected_version = self.detect_os_type(os_name)
-        
-        # Use provided version if available, otherwise use detected version
-        version = os_version or detected_version or 'Unknown'
+        # When the caller already has a structured version (the common
+        # inventory path), only the type is needed, so skip the version
+        # extraction regexes and classify with the single combined scan
+        if os_version:
+            match = self._combined_pattern.search(os_name.lower())
+            os_type = match.lastgroup if match else 'unknown'
+            version = os_version
+        else:
+            os_type, detected_version = self.detect_os_type(os_name)
+            version = detected_version or 'Unknown'
         
         # For Windows client, ensure we're using just the numeric version
         if os_type == 'windows_client' and version != 'Unknown':
@@ -134,6 +194,22 @@ class OSDetector:
             'full_name': full_name
         }
     
+    def normalize_many(self, os_names) -> list:
+        """
+        Normalize a batch of OS name strings.
+
+        Args:
+            os_names: Iterable of OS name strings
+
+        Returns:
+            List of normalized OS info dictionaries, one per input,
+            in order
+        """
+        # Bind the per-item call once; combined with the classification
+        # cache, repeated strings in an inventory cost a dict hit each
+        normalize = self.normalize_os_info
+        return [normalize(name) for name in os_names]
+
     def is_server_os(self, os_info: str) -> bool:
         """
         Determine if the OS is a server operating system.
@@ -144,8 +220,10 @@ class OSDetector:
         Returns:
             True if server OS, False otherwise
         """
-        os_type, _ = self.detect_os_type(os_info)
-        return os_type == 'windows_server' or ('linux' in os_info.lower() and 'server' in os_info.lower())
+        # The answer only depends on two substrings, so a C-level scan of
+        # the lowercased string beats full regex classification
+        s = os_info.lower() if os_info else ''
+        return 'server' in s and ('windows' in s or 'linux' in s)
     
     def get_os_family(self, os_info: str) -> str:
         """
@@ -157,9 +235,18 @@ class OSDetector:
         Returns:
             OS family name
         """
+        # Tiered substring tests decide the family for the common strings;
+        # only ambiguous input falls through to the regex classifier
+        s = os_info.lower() if os_info else ''
+        if 'windows' in s:
+            return 'Windows'
+        if 'linux' in s:
+            return 'Linux'
+        if 'mac' in s or 'darwin' in s:
+            return 'macOS'
+
         os_type, _ = self.detect_os_type(os_info)
-        
-        if os_type in ['windows_server', 'windows_client']:
+        if os_type in ('windows_server', 'windows_client'):
             return 'Windows'
         elif os_type == 'linux':
             return 'Linux'
@@ -190,20 +277,13 @@ class OSDetector:
             'build': parts[2] if len(parts) > 2 else 'Unknown'
         }
         
-        # Map Windows 10/11 build numbers to recognizable versions
+        # Map Windows 10/11 build numbers to recognizable versions via a
+        # binary search over the sorted threshold table
         if result['major'] == '10':
             build = result.get('build', '')
             if build.isdigit():
-                build_num = int(build)
-                if build_num >= 22000:
-                    result['marketing_version'] = 'Windows 11'
-                elif build_num >= 19042:
-                    result['marketing_version'] = 'Windows 10 20H2 or newer'
-                elif build_num >= 19041:
-                    result['marketing_version'] = 'Windows 10 2004'
-                elif build_num >= 18363:
-                    result['marketing_version'] = 'Windows 10 1909'
-                else:
-                    result['marketing_version'] = f"Windows 10 (Build {build})"
-        
+                idx = bisect.bisect_right(_BUILD_THRESHOLDS, int(build)) - 1
+                result['marketing_version'] = (_BUILD_NAMES[idx] if idx >= 0
+                                               else f"Windows 10 (Build {build})")
+
         return result
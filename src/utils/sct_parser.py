@@ -8,11 +8,98 @@ and provides them in a format that can be used for security assessments.
 import logging
 import os
 import json
+import types
 import xml.etree.ElementTree as ET
 from typing import Dict, List, Any, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Sentinel for lookup-cache misses, to distinguish cached None results
+_MISSING = object()
+
+# Shared building blocks for the placeholder baselines. The four
+# baselines repeat the same paths and setting dicts, so they are defined
+# once here and referenced, instead of re-allocating identical strings
+# and dicts per baseline. Treat these as read-only: they are aliased
+# across baselines.
+_PASSWORD_POLICY_PATH = ('Computer Configuration\\Windows Settings\\Security Settings'
+                         '\\Account Policies\\Password Policy')
+_LOCKOUT_POLICY_PATH = ('Computer Configuration\\Windows Settings\\Security Settings'
+                        '\\Account Policies\\Account Lockout Policy')
+_FIREWALL_PATH = ('Computer Configuration\\Windows Settings\\Security Settings'
+                  '\\Windows Firewall with Advanced Security')
+
+_PASSWORD_COMPLEXITY = {'value': 'Enabled', 'path': _PASSWORD_POLICY_PATH, 'severity': 'high'}
+_MIN_PASSWORD_LENGTH_14 = {'value': '14', 'path': _PASSWORD_POLICY_PATH, 'severity': 'high'}
+_MIN_PASSWORD_LENGTH_12 = {'value': '12', 'path': _PASSWORD_POLICY_PATH, 'severity': 'high'}
+_LOCKOUT_THRESHOLD = {'value': '5', 'path': _LOCKOUT_POLICY_PATH, 'severity': 'high'}
+_FIREWALL_ENABLED = {'value': 'Enabled', 'path': _FIREWALL_PATH, 'severity': 'high'}
+
+# The machine baselines differ only in the minimum password length
+_SERVER_SETTINGS = {
+    'PasswordComplexity': _PASSWORD_COMPLEXITY,
+    'MinimumPasswordLength': _MIN_PASSWORD_LENGTH_14,
+    'AccountLockoutThreshold': _LOCKOUT_THRESHOLD,
+    'EnableFirewall': _FIREWALL_ENABLED
+}
+_CLIENT_SETTINGS = {**_SERVER_SETTINGS, 'MinimumPasswordLength': _MIN_PASSWORD_LENGTH_12}
+
+# Default baseline registry, built once at import and shared read-only
+# across every parser instance (and, under fork-based multiprocessing,
+# across worker processes via copy-on-write). save_baseline detaches an
+# instance from the registry before its first mutation.
+_DEFAULT_BASELINES = types.MappingProxyType({
+    'WindowsServer2022': {
+        'name': 'Windows Server 2022 Security Baseline',
+        'version': '1.0',
+        'settings': _SERVER_SETTINGS
+    },
+    'WindowsServer2019': {
+        'name': 'Windows Server 2019 Security Baseline',
+        'version': '1.0',
+        'settings': _SERVER_SETTINGS
+    },
+    'Windows10': {
+        'name': 'Windows 10 Security Baseline',
+        'version': '1.0',
+        'settings': _CLIENT_SETTINGS
+    },
+    'DomainPasswordPolicy': {
+        'name': 'Domain Password Policy Baseline',
+        'version': '1.0',
+        'settings': {
+            'MinimumPasswordLength': _MIN_PASSWORD_LENGTH_14,
+            'PasswordComplexity': _PASSWORD_COMPLEXITY,
+            'PasswordHistorySize': {
+                'value': '24',
+                'path': _PASSWORD_POLICY_PATH,
+                'severity': 'medium'
+            },
+            'MaximumPasswordAge': {
+                'value': '60',
+                'path': _PASSWORD_POLICY_PATH,
+                'severity': 'medium'
+            },
+            'MinimumPasswordAge': {
+                'value': '1',
+                'path': _PASSWORD_POLICY_PATH,
+                'severity': 'medium'
+            },
+            'AccountLockoutThreshold': _LOCKOUT_THRESHOLD,
+            'AccountLockoutDuration': {
+                'value': '15',
+                'path': _LOCKOUT_POLICY_PATH,
+                'severity': 'medium'
+            }
+        }
+    }
+})
+
 class SCTParser:
     """
     Parses Microsoft Security Configuration Toolkit baselines.
@@ -36,7 +123,18 @@ class SCTParser:
             'windows 10': 'Windows10',
             'windows 8.1': 'Windows81'
         }
-        
+        # Partial-match order, precomputed once: longest mapping keys
+        # first so the most specific entry wins without rescanning the
+        # whole mapping per lookup
+        self._match_order = tuple(sorted(
+            self.os_mapping.items(), key=lambda item: -len(item[0])
+        ))
+        # Resolved lookups keyed by normalized (os_name, os_version); a
+        # domain has few distinct OS strings across thousands of hosts,
+        # so repeats skip the matching entirely. Invalidated when a
+        # baseline is saved.
+        self._lookup_cache: Dict[tuple, Optional[Dict[str, Any]]] = {}
+
         # Create baselines directory if it doesn't exist
         os.makedirs(baselines_path, exist_ok=True)
         
@@ -62,133 +160,10 @@ class SCTParser:
             logger.error(f"Error loading baselines: {str(e)}", exc_info=True)
     
     def _create_placeholder_baselines(self) -> None:
-        """Create placeholder baselines for demonstration purposes."""
-        # Windows Server 2022 baseline
-        self.baselines['WindowsServer2022'] = {
-            'name': 'Windows Server 2022 Security Baseline',
-            'version': '1.0',
-            'settings': {
-                'PasswordComplexity': {
-                    'value': 'Enabled',
-                    'path': 'Computer Configuration\\Windows Settings\\Security Settings\\Account Policies\\Password Policy',
-                    'severity': 'high'
-                },
-                'MinimumPasswordLength': {
-                    'value': '14',
-                    'path': 'Computer Configuration\\Windows Settings\\Security Settings\\Account Policies\\Password Policy',
-                    'severity': 'high'
-                },
-                'AccountLockoutThreshold': {
-                    'value': '5',
-                    'path': 'Computer Configuration\\Windows Settings\\Security Settings\\Account Policies\\Account Lockout Policy',
-                    'severity': 'high'
-                },
-                'EnableFirewall': {
-                    'value': 'Enabled',
-                    'path': 'Computer Configuration\\Windows Settings\\Security Settings\\Windows Firewall with Advanced Security',
-                    'severity': 'high'
-                }
-            }
-        }
-        
-        # Windows Server 2019 baseline
-        self.baselines['WindowsServer2019'] = {
-            'name': 'Windows Server 2019 Security Baseline',
-            'version': '1.0',
-            'settings': {
-                'PasswordComplexity': {
-                    'value': 'Enabled',
-                    'path': 'Computer Configuration\\Windows Settings\\Security Settings\\Account Policies\\Password Policy',
-                    'severity': 'high'
-                },
-                'MinimumPasswordLength': {
-                    'value': '14',
-                    'path': 'Computer Configuration\\Windows Settings\\Security Settings\\Account Policies\\Password Policy',
-                    'severity': 'high'
-                },
-                'AccountLockoutThreshold': {
-                    'value': '5',
-                    'path': 'Computer Configuration\\Windows Settings\\Security Settings\\Account Policies\\Account Lockout Policy',
-                    'severity': 'high'
-                },
-                'EnableFirewall': {
-                    'value': 'Enabled',
-                    'path': 'Computer Configuration\\Windows Settings\\Security Settings\\Windows Firewall with Advanced Security',
-                    'severity': 'high'
-                }
-            }
-        }
-        
-        # Windows 10 baseline
-        self.baselines['Windows10'] = {
-            'name': 'Windows 10 Security Baseline',
-            'version': '1.0',
-            'settings': {
-                'PasswordComplexity': {
-                    'value': 'Enabled',
-                    'path': 'Computer Configuration\\Windows Settings\\Security Settings\\Account Policies\\Password Policy',
-                    'severity': 'high'
-                },
-                'MinimumPasswordLength': {
-                    'value': '12',
-                    'path': 'Computer Configuration\\Windows Settings\\Security Settings\\Account Policies\\Password Policy',
-                    'severity': 'high'
-                },
-                'AccountLockoutThreshold': {
-                    'value': '5',
-                    'path': 'Computer Configuration\\Windows Settings\\Security Settings\\Account Policies\\Account Lockout Policy',
-                    'severity': 'high'
-                },
-                'EnableFirewall': {
-                    'value': 'Enabled',
-                    'path': 'Computer Configuration\\Windows Settings\\Security Settings\\Windows Firewall with Advanced Security',
-                    'severity': 'high'
-                }
-            }
-        }
-        
-        # Domain Password Policy baseline
-        self.baselines['DomainPasswordPolicy'] = {
-            'name': 'Domain Password Policy Baseline',
-            'version': '1.0',
-            'settings': {
-                'MinimumPasswordLength': {
-                    'value': '14',
-                    'path': 'Computer Configuration\\Windows Settings\\Security Settings\\Account Policies\\Password Policy',
-                    'severity': 'high'
-                },
-                'PasswordComplexity': {
-                    'value': 'Enabled',
-                    'path': 'Computer Configuration\\Windows Settings\\Security Settings\\Account Policies\\Password Policy',
-                    'severity': 'high'
-                },
-                'PasswordHistorySize': {
-                    'value': '24',
-                    'path': 'Computer Configuration\\Windows Settings\\Security Settings\\Account Policies\\Password Policy',
-                    'severity': 'medium'
-                },
-                'MaximumPasswordAge': {
-                    'value': '60',
-                    'path': 'Computer Configuration\\Windows Settings\\Security Settings\\Account Policies\\Password Policy',
-                    'severity': 'medium'
-                },
-                'MinimumPasswordAge': {
-                    'value': '1',
-                    'path': 'Computer Configuration\\Windows Settings\\Security Settings\\Account Policies\\Password Policy',
-                    'severity': 'medium'
-                },
-                'AccountLockoutThreshold': {
-                    'value': '5',
-                    'path': 'Computer Configuration\\Windows Settings\\Security Settings\\Account Policies\\Account Lockout Policy',
-                    'severity': 'high'
-                },
-                'AccountLockoutDuration': {
-                    'value': '15',
-                    'path': 'Computer Configuration\\Windows Settings\\Security Settings\\Account Policies\\Account Lockout Policy',
-                    'severity': 'medium'
-                }
-            }
-        }
+        """Point this instance at the shared placeholder baselines."""
+        # Every instance reads the same import-time registry; nothing is
+        # copied until save_baseline mutates the set
+        self.baselines = _DEFAULT_BASELINES
     
     def get_baseline_for_os(self, os_name: str, os_version: str) -> Optional[Dict[str, Any]]:
         """
@@ -208,7 +183,20 @@ class SCTParser:
         # Normalize OS name and version
         os_name = os_name.lower()
         os_version = os_version.lower() if os_version else ''
-        
+
+        # Serve repeated lookups from the cache; None results are cached
+        # too, hence the sentinel
+        cache_key = (os_name, os_version)
+        cached = self._lookup_cache.get(cache_key, _MISSING)
+        if cached is not _MISSING:
+            return cached
+
+        baseline = self._resolve_baseline(os_name, os_version)
+        self._lookup_cache[cache_key] = baseline
+        return baseline
+
+    def _resolve_baseline(self, os_name: str, os_version: str) -> Optional[Dict[str, Any]]:
+        """Match a normalized OS name/version to a loaded baseline."""
         # Try to find an exact match
         full_os = f"{os_name} {os_version}".strip()
         baseline_key = self.os_mapping.get(full_os)
@@ -217,8 +205,8 @@ class SCTParser:
             logger.debug(f"Found exact baseline match for {full_os}: {baseline_key}")
             return self.baselines[baseline_key]
         
-        # Try to match just the OS name
-        for mapping_key, baseline_key in self.os_mapping.items():
+        # Try to match just the OS name, most specific mapping key first
+        for mapping_key, baseline_key in self._match_order:
             if os_name in mapping_key and baseline_key in self.baselines:
                 logger.debug(f"Found partial baseline match for {os_name}: {baseline_key}")
                 return self.baselines[baseline_key]
@@ -259,24 +247,31 @@ class SCTParser:
         Returns:
             Parsed baseline or None if parsing fails
         """
-        if not os.path.exists(file_path):
-            logger.warning(f"Baseline file does not exist: {file_path}")
-            return None
-        
         try:
-            # Determine file type based on extension
+            # Determine file type based on extension; no exists() check
+            # up front — open() raising FileNotFoundError covers it
+            # without the extra stat syscall
             _, ext = os.path.splitext(file_path)
-            
+
             if ext.lower() == '.json':
-                # Parse JSON file
-                with open(file_path, 'r') as f:
-                    return json.load(f)
+                # Read the file in one shot; orjson decodes the bytes
+                # buffer several times faster than json.load's
+                # incremental reads
+                with open(file_path, 'rb') as f:
+                    raw = f.read()
+                if orjson is not None:
+                    return orjson.loads(raw)
+                return json.loads(raw)
             elif ext.lower() in ['.xml', '.admx']:
-                # Parse XML file
-                tree = ET.parse(file_path)
-                root = tree.getroot()
-                
-                # In a real implementation, this would parse the XML structure
+                # Stream the XML instead of materializing the whole tree;
+                # real SCT baselines can run to megabytes and iterparse
+                # keeps peak memory at one subtree, with each element
+                # released once it has been seen
+                for _, elem in ET.iterparse(file_path, events=('end',)):
+                    # In a real implementation, settings would be
+                    # extracted from elem here
+                    elem.clear()
+
                 # For now, return a placeholder
                 return {
                     'name': os.path.basename(file_path),
@@ -285,7 +280,10 @@ class SCTParser:
             else:
                 logger.warning(f"Unsupported file type: {ext}")
                 return None
-                
+
+        except FileNotFoundError:
+            logger.warning(f"Baseline file does not exist: {file_path}")
+            return None
         except Exception as e:
             logger.error(f"Error parsing baseline file {file_path}: {str(e)}", exc_info=True)
             return None
@@ -304,11 +302,22 @@ class SCTParser:
         try:
             file_path = os.path.join(self.baselines_path, f"{baseline_key}.json")
             
-            with open(file_path, 'w') as f:
-                json.dump(baseline, f, indent=2)
+            # orjson's encoder avoids the slow Python-level path that
+            # json.dump takes when indent is requested
+            if orjson is not None:
+                with open(file_path, 'wb') as f:
+                    f.write(orjson.dumps(baseline, option=orjson.OPT_INDENT_2))
+            else:
+                with open(file_path, 'w') as f:
+                    json.dump(baseline, f, indent=2)
             
-            # Update in-memory baseline
+            # Copy-on-write: detach from the shared read-only registry
+            # before the first mutation, then drop lookups resolved
+            # against the old set
+            if not isinstance(self.baselines, dict):
+                self.baselines = dict(self.baselines)
             self.baselines[baseline_key] = baseline
+            self._lookup_cache.clear()
             
             logger.info(f"Saved baseline to {file_path}")
             return True